@@ -3,16 +3,32 @@
 import argparse
 import asyncio
 import os
+from typing import TYPE_CHECKING, Any
 
 # Suppress warnings before importing libraries that trigger them
 os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")  # HuggingFace tokenizers fork warning
 os.environ.setdefault("LANCEDB_LOG", "error")  # LanceDB "No existing dataset" warning
 
-from .chat import direct_chat_loop, programmatic_chat_loop  # noqa: E402
-from .ui import print_info  # noqa: E402
+if TYPE_CHECKING:
+    from .chat import direct_chat_loop, programmatic_chat_loop
 
 __version__ = "0.1.0"
 
+__all__ = ["direct_chat_loop", "main_direct", "main_programmatic", "programmatic_chat_loop"]
+
+# Heavy dependencies (langchain, langgraph, LanceDB, MCP) are imported lazily so that
+# argument parsing and --help don't pay for them.
+_LAZY_EXPORTS = {"direct_chat_loop", "programmatic_chat_loop"}
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily re-export chat loops from .chat (PEP 562)."""
+    if name in _LAZY_EXPORTS:
+        from . import chat
+
+        return getattr(chat, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def main_direct() -> None:
     """Entry point for direct mode CLI."""
@@ -20,7 +36,11 @@ def main_direct() -> None:
     parser.add_argument("--resume", "-r", action="store_true", help="Resume existing thread")
     args = parser.parse_args()
 
+    from .ui import print_info
+
     try:
+        from .chat import direct_chat_loop
+
         asyncio.run(direct_chat_loop(resume=args.resume))
     except KeyboardInterrupt:
         print_info("\nGoodbye!")
@@ -32,7 +52,11 @@ def main_programmatic() -> None:
     parser.add_argument("--resume", "-r", action="store_true", help="Resume existing thread")
     args = parser.parse_args()
 
+    from .ui import print_info
+
     try:
+        from .chat import programmatic_chat_loop
+
         asyncio.run(programmatic_chat_loop(resume=args.resume))
     except KeyboardInterrupt:
         print_info("\nGoodbye!")
@@ -1,32 +1,40 @@
 """Agent creation and configuration."""
 
-from contextlib import AsyncExitStack
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
 from langchain.agents import create_agent
-from langchain.agents.middleware import HumanInTheLoopMiddleware, SummarizationMiddleware
+from langchain.agents.middleware import HumanInTheLoopMiddleware, InterruptOnConfig, SummarizationMiddleware
 from langchain.agents.middleware.types import AgentMiddleware
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.tools import BaseTool
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.graph.state import CompiledStateGraph
 
-from .llm import create_chat_model
+from .llm import cacheable_system_prompt, create_chat_model
 from .middleware import (
     IndexConfig,
+    SuggestionStore,
     SuggestMiddleware,
     TokenUsageLoggingMiddleware,
     ToolSearchFilterMiddleware,
+    get_suggest_cache_mode,
 )
 from .tools import (
     TOOL_REGISTRY,
     SearchToolsOrSkillsTool,
+    create_cache_tools,
     create_execute_code_tool,
     discover_mcp_servers,
     enable_tool,
     get_skill,
     get_skill_index,
     get_tool_index,
+    get_tool_result_cache,
     load_mcp_tools,
     register_builtin_tools,
     search_skills,
@@ -34,6 +42,8 @@ from .tools import (
     tool_search_regex,
 )
 from .tools.sandbox import is_srt_available
+from .tools.skills import SkillIndex
+from .tools.tool_search import ToolIndex
 
 # SRT sandbox settings (project root)
 SRT_SETTINGS_PATH = Path(__file__).parent.parent / "srt-settings.json"
@@ -67,6 +77,124 @@ DIRECT_SYSTEM_PROMPT = """You are a helpful assistant.
 
 Use tool_search or tool_search_regex to find available tools, then use them to help the user."""
 
+# SQLite tuning for the checkpoint DB (AsyncSqliteSaver.setup() already enables WAL)
+_CHECKPOINT_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Shared checkpointer: one SQLite connection per process (see _shared_checkpointer)
+_checkpointer: AsyncSqliteSaver | None = None
+_checkpointer_stack: AsyncExitStack | None = None
+_checkpointer_users = 0
+_checkpointer_lock = asyncio.Lock()
+_checkpoint_dir_ready = False
+
+
+async def _close_checkpointer() -> None:
+    """Close the shared checkpointer connection (caller must hold the lock)."""
+    global _checkpointer, _checkpointer_stack, _checkpointer_users
+    if _checkpointer_stack is not None:
+        await _checkpointer_stack.aclose()
+    _checkpointer = None
+    _checkpointer_stack = None
+    _checkpointer_users = 0
+
+
+@asynccontextmanager
+async def _shared_checkpointer() -> AsyncIterator[AsyncSqliteSaver]:
+    """Use the process-wide SQLite checkpointer.
+
+    The connection is opened on first use and closed when the last user exits.
+    """
+    global _checkpointer, _checkpointer_stack, _checkpointer_users, _checkpoint_dir_ready
+    async with _checkpointer_lock:
+        if _checkpointer is None:
+            if not _checkpoint_dir_ready:
+                CHECKPOINT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+                _checkpoint_dir_ready = True
+            stack = AsyncExitStack()
+            _checkpointer = await stack.enter_async_context(AsyncSqliteSaver.from_conn_string(str(CHECKPOINT_DB_PATH)))
+            _checkpointer_stack = stack
+            # With WAL, synchronous=NORMAL: checkpoint commits no longer fsync on every graph step
+            async with _checkpointer.lock:
+                for pragma in _CHECKPOINT_PRAGMAS:
+                    await _checkpointer.conn.execute(pragma)
+        _checkpointer_users += 1
+        checkpointer = _checkpointer
+
+    try:
+        yield checkpointer
+    finally:
+        async with _checkpointer_lock:
+            _checkpointer_users -= 1
+            if _checkpointer_users <= 0:
+                await _close_checkpointer()
+
+
+async def reset_checkpointer() -> None:
+    """Close the shared checkpointer regardless of active users (for tests)."""
+    async with _checkpointer_lock:
+        await _close_checkpointer()
+
+
+async def _open_resources(exit_stack: AsyncExitStack) -> tuple[AsyncSqliteSaver, list[BaseTool]]:
+    """Open the shared checkpointer and load MCP tools concurrently.
+
+    Both are registered on exit_stack. MCP servers are loaded in the current
+    task while the checkpointer is opened in a background task.
+
+    Returns:
+        Tuple of (checkpointer, mcp_tools).
+    """
+    checkpointer_task = asyncio.create_task(exit_stack.enter_async_context(_shared_checkpointer()))
+    try:
+        mcp_tools: list[BaseTool] = []
+        if discover_mcp_servers():
+            mcp_stack, mcp_tools = await load_mcp_tools()
+            await exit_stack.enter_async_context(mcp_stack)
+        checkpointer = await checkpointer_task
+    except BaseException:
+        # Wait for the checkpointer so it is closed along with everything else
+        await asyncio.gather(checkpointer_task, return_exceptions=True)
+        await exit_stack.aclose()
+        raise
+    return checkpointer, mcp_tools
+
+
+# Stateless, so one instance serves every agent
+_token_usage_middleware = TokenUsageLoggingMiddleware()
+
+
+def _create_summarization_middleware(model: BaseChatModel) -> SummarizationMiddleware:
+    """Create the summarization middleware for a model."""
+    return SummarizationMiddleware(
+        model=model,
+        trigger=("fraction", 0.7),
+        keep=("messages", 20),
+    )
+
+
+def _create_suggest_middleware(tool_index: ToolIndex, skill_index: SkillIndex, top_k: int = 5) -> SuggestMiddleware:
+    """Create the suggest middleware for a pair of indexes."""
+    return SuggestMiddleware(
+        indexes=[
+            IndexConfig(
+                index=tool_index,
+                label="tool",
+                usage_hint="Use enable_tool(name) to enable tools.",
+            ),
+            IndexConfig(
+                index=skill_index,
+                label="skill",
+                usage_hint="Use get_skill(name) to retrieve full skill content.",
+            ),
+        ],
+        top_k=top_k,
+        store=SuggestionStore() if get_suggest_cache_mode() == "persist" else None,
+    )
+
 
 async def create_programmatic_agent(
     model_name: str | None = None,
@@ -95,42 +223,31 @@ async def create_programmatic_agent(
     # Register built-in tools
     register_builtin_tools()
 
-    # Load MCP tools if servers exist
+    # Open checkpointer and load MCP tools (if servers exist)
     exit_stack = AsyncExitStack()
-    mcp_tools: list[BaseTool] = []
-    if discover_mcp_servers():
-        exit_stack, mcp_tools = await load_mcp_tools()
+    checkpointer, mcp_tools = await _open_resources(exit_stack)
 
-    # Build sandbox tools registry (tools callable via tool_call() in execute_code)
-    sandbox_tools = {**TOOL_REGISTRY, **{t.name: t for t in mcp_tools}}
+    # Build sandbox tools registry (tools callable via tool_call() in execute_code),
+    # including cache_get/cache_invalidate for memoized results of cacheable tools
+    result_cache = get_tool_result_cache()
+    sandbox_tools = {**TOOL_REGISTRY, **{t.name: t for t in [*mcp_tools, *create_cache_tools(result_cache)]}}
     get_tool_index(sandbox_tools)
 
     # Create execute_code tool with access to sandbox tools
-    execute_code = create_execute_code_tool(sandbox_tools, srt_settings=SRT_SETTINGS_PATH)
+    execute_code = create_execute_code_tool(sandbox_tools, srt_settings=SRT_SETTINGS_PATH, result_cache=result_cache)
     # Skill tools are for LLM reference, not for execute_code
     tools: list[BaseTool] = [tool_search, tool_search_regex, enable_tool, execute_code, search_skills, get_skill]
 
     # Create the model
     model = create_chat_model(model_name)
 
-    # Create checkpointer for conversation persistence
-    CHECKPOINT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    checkpointer = await exit_stack.enter_async_context(AsyncSqliteSaver.from_conn_string(str(CHECKPOINT_DB_PATH)))
-
     # Create the agent
     agent: CompiledStateGraph[Any] = create_agent(
         model=model,
         tools=tools,
-        system_prompt=system_prompt or PROGRAMMATIC_SYSTEM_PROMPT,
+        system_prompt=cacheable_system_prompt(system_prompt or PROGRAMMATIC_SYSTEM_PROMPT, model),
         checkpointer=checkpointer,
-        middleware=[
-            TokenUsageLoggingMiddleware(),
-            SummarizationMiddleware(
-                model=model,
-                trigger=("fraction", 0.7),
-                keep=("messages", 20),
-            ),
-        ],
+        middleware=[_token_usage_middleware, _create_summarization_middleware(model)],
     )
 
     return agent, checkpointer, exit_stack
@@ -144,7 +261,7 @@ class DirectModeAgentFactory:
     Usage as async context manager:
         async with DirectModeAgentFactory(...) as factory:
             # factory.middleware and factory.checkpointer available
-            agent = factory.create_agent()  # lazy creation
+            agent = factory.agent  # lazy creation
             ...
     """
 
@@ -152,7 +269,7 @@ class DirectModeAgentFactory:
         self,
         model_name: str | None = None,
         system_prompt: str | None = None,
-        hitl_tools: set[str] | None = None,
+        hitl_tools: Iterable[str] | None = None,
     ):
         """Initialize the factory.
 
@@ -164,11 +281,14 @@ class DirectModeAgentFactory:
         self.model = create_chat_model(model_name)
         self.system_prompt = system_prompt or DIRECT_SYSTEM_PROMPT
         self.checkpointer: AsyncSqliteSaver | None = None
-        self.hitl_tools = hitl_tools or set()
+        self.hitl_tools = frozenset(hitl_tools or ())
+        self._hitl_interrupt_on: dict[str, bool | InterruptOnConfig] = {name: True for name in self.hitl_tools}
         self._registered_tools: dict[str, BaseTool] = {}
+        self._registered_tool_list: tuple[BaseTool, ...] = ()
         self._tool_filter: ToolSearchFilterMiddleware | None = None
+        # Created on the first build and kept across rebuilds (it tracks this factory's conversation)
+        self._suggest_middleware: SuggestMiddleware | None = None
         self._exit_stack: AsyncExitStack | None = None
-        self._agent: CompiledStateGraph[Any] | None = None
 
     async def __aenter__(self) -> "DirectModeAgentFactory":
         """Enter context: initialize resources."""
@@ -192,41 +312,28 @@ class DirectModeAgentFactory:
         """Initialize the factory by registering tools and checkpointer."""
         register_builtin_tools()
 
+        # Open the shared SQLite checkpointer and load MCP tools (if servers exist)
         exit_stack = AsyncExitStack()
+        self.checkpointer, mcp_tools = await _open_resources(exit_stack)
 
-        # Initialize SQLite checkpointer
-        CHECKPOINT_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        self.checkpointer = await exit_stack.enter_async_context(
-            AsyncSqliteSaver.from_conn_string(str(CHECKPOINT_DB_PATH))
-        )
-
-        # Load MCP tools if servers exist
-        mcp_tools: list[BaseTool] = []
-        if discover_mcp_servers():
-            mcp_stack, mcp_tools = await load_mcp_tools()
-            await exit_stack.enter_async_context(mcp_stack)
-
-        # Build combined registry
+        # Snapshot the combined registry (fixed after init, so the tool list is built once)
         self._registered_tools = {**TOOL_REGISTRY, **{t.name: t for t in mcp_tools}}
+        self._registered_tool_list = tuple(self._registered_tools.values())
         self._tool_filter = ToolSearchFilterMiddleware(self._registered_tools)
 
         self._exit_stack = exit_stack
 
-    def create_agent(self) -> CompiledStateGraph[Any]:
+    def _build_agent(self) -> CompiledStateGraph[Any]:
         """Create an agent with all tools registered.
 
         Middleware filters which tools are visible to the LLM based on
-        tool_search discoveries.
+        tool_search discoveries. Accessed through the cached `agent` property.
 
         Returns:
             Compiled agent graph.
         """
-        # Return cached agent if available
-        if self._agent is not None:
-            return self._agent
-
         if self._tool_filter is None:
-            raise RuntimeError("Use 'async with' before create_agent()")
+            raise RuntimeError("Use 'async with' before accessing agent")
 
         # Create indexes (shared between SuggestMiddleware and SearchToolsOrSkillsTool)
         tool_index = get_tool_index(self._registered_tools)
@@ -247,46 +354,33 @@ class DirectModeAgentFactory:
             search_tools_or_skills,
             search_skills,
             get_skill,
+            *self._registered_tool_list,
         ]
-        tools.extend(self._registered_tools.values())
+
+        if self._suggest_middleware is None:
+            self._suggest_middleware = _create_suggest_middleware(tool_index, skill_index)
 
         # Build middleware list
         middlewares: list[AgentMiddleware[Any, Any]] = [
             self._tool_filter,
-            SuggestMiddleware(
-                indexes=[
-                    IndexConfig(
-                        index=tool_index,
-                        label="tool",
-                        usage_hint="Use enable_tool(name) to enable tools.",
-                    ),
-                    IndexConfig(
-                        index=skill_index,
-                        label="skill",
-                        usage_hint="Use get_skill(name) to retrieve full skill content.",
-                    ),
-                ],
-                top_k=5,
-            ),
-            TokenUsageLoggingMiddleware(),
-            SummarizationMiddleware(
-                model=self.model,
-                trigger=("fraction", 0.7),
-                keep=("messages", 20),
-            ),
+            self._suggest_middleware,
+            _token_usage_middleware,
+            _create_summarization_middleware(self.model),
         ]
 
-        # Add HITL middleware for tools that require approval
+        # Add HITL middleware for tools that require approval, unless none of them is registered
         # Note: HITL applies even before discovery since all tools are registered
-        if self.hitl_tools:
-            middlewares.append(HumanInTheLoopMiddleware(interrupt_on={name: True for name in self.hitl_tools}))
+        if self.hitl_tools and any(t.name in self._hitl_interrupt_on for t in tools):
+            middlewares.append(HumanInTheLoopMiddleware(interrupt_on=self._hitl_interrupt_on))
 
-        self._agent = create_agent(
+        agent: CompiledStateGraph[Any] = create_agent(
             model=self.model,
             tools=tools,
-            system_prompt=self.system_prompt,
+            system_prompt=cacheable_system_prompt(self.system_prompt, self.model),
             middleware=middlewares,
             checkpointer=self.checkpointer,
         )
+        return agent
 
-        return self._agent
+    # Built on first access; `del factory.agent` forces a rebuild
+    agent = cached_property(_build_agent)
@@ -1,14 +1,20 @@
 """Common utilities for chat loops."""
 
-from collections.abc import AsyncIterator
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
 from langchain_core.messages import AIMessageChunk
+from prompt_toolkit import PromptSession
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.keys import Keys
 
 from ..ui import (
+    console,
     print_code_execution,
+    print_error,
+    print_info,
     print_streaming_end,
     print_streaming_start,
     print_streaming_token,
@@ -42,67 +48,189 @@ def create_key_bindings() -> KeyBindings:
     return kb
 
 
+class StreamBuffer:
+    """Coalesces streamed tokens into fewer terminal writes.
+
+    Buffered text is written when it contains a newline, exceeds max_size
+    characters, has been buffered for max_delay seconds, or on flush().
+    Must be used from a running event loop (the delayed write is scheduled on it).
+    """
+
+    def __init__(self, max_size: int = 256, max_delay: float = 0.02) -> None:
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._parts: list[str] = []
+        self._size = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def append(self, text: str) -> None:
+        """Buffer text, writing it out if a flush condition is met."""
+        self._parts.append(text)
+        self._size += len(text)
+        if "\n" in text or self._size >= self.max_size:
+            self.flush()
+        elif self._flush_handle is None:
+            # Write the text after max_delay even if no more events arrive (e.g. a model stall)
+            self._flush_handle = asyncio.get_running_loop().call_later(self.max_delay, self.flush)
+
+    def flush(self) -> None:
+        """Write out buffered text."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._parts:
+            print_streaming_token("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+
+# Shared read-only default for missing event fields
+_EMPTY: dict[str, Any] = {}
+
+
+def _on_chat_model_stream(event: dict[str, Any], recent_run_ids: deque[str], buf: StreamBuffer) -> None:  # noqa: ARG001
+    """Buffer text from a streamed model chunk."""
+    chunk = event["data"].get("chunk")
+    if not isinstance(chunk, AIMessageChunk):
+        return
+    content = chunk.content
+    # Common case: plain text token
+    if isinstance(content, str):
+        if content:
+            buf.append(content)
+        return
+    # Content blocks: join text blocks into one append
+    text = "".join(
+        item["text"] for item in content if isinstance(item, dict) and item.get("type") == "text" and item.get("text")
+    )
+    if text:
+        buf.append(text)
+
+
+def _on_tool_start(event: dict[str, Any], recent_run_ids: deque[str], buf: StreamBuffer) -> None:  # noqa: ARG001
+    """Print a tool call (or the code for execute_code)."""
+    tool_name = event.get("name", "")
+    tool_input: dict[str, Any] = event["data"].get("input", _EMPTY)
+
+    # End streaming line before tool output
+    buf.flush()
+    print_streaming_end()
+
+    if tool_name == "execute_code":
+        code = tool_input.get("code", "")
+        if code:
+            print_code_execution(code)
+    else:
+        print_tool_call(tool_name, tool_input)
+
+
+def _on_tool_end(event: dict[str, Any], recent_run_ids: deque[str], buf: StreamBuffer) -> None:
+    """Print a tool result once per run."""
+    buf.flush()
+    tool_name = event.get("name", "")
+    output = event["data"].get("output", "")
+    run_id = event.get("run_id", "")
+
+    if run_id not in recent_run_ids:
+        recent_run_ids.append(run_id)
+        if isinstance(output, str):
+            print_tool_result(tool_name, output)
+        else:
+            print_tool_result(tool_name, str(output))
+
+    # Restart streaming indicator
+    print_streaming_start()
+
+
+# Stream event kind -> handler; other events are ignored
+_HANDLERS: dict[str, Callable[[dict[str, Any], deque[str], StreamBuffer], None]] = {
+    "on_chat_model_stream": _on_chat_model_stream,
+    "on_tool_start": _on_tool_start,
+    "on_tool_end": _on_tool_end,
+}
+
+
 async def process_stream_events(
     event_stream: AsyncIterator[Any],
+    interrupts: list[Any] | None = None,
 ) -> bool:
     """Process streaming events from agent.
 
     Args:
         event_stream: Async iterator of events.
+        interrupts: If given, graph interrupts seen in the stream are appended to it.
 
     Returns:
         True if interrupted by KeyboardInterrupt, False otherwise.
     """
-    printed_tool_results: set[str] = set()
+    # Guards against duplicate tool end events; only recent runs need remembering
+    recent_run_ids: deque[str] = deque(maxlen=32)
+    buf = StreamBuffer()
+    # Bound to locals: these run once per streamed event
+    get_handler = _HANDLERS.get
+    flush = buf.flush
 
     try:
         async for event in event_stream:
-            kind = event.get("event", "")
-            data = event.get("data", {})
-
-            if kind == "on_chat_model_stream":
-                chunk = data.get("chunk")
-                if isinstance(chunk, AIMessageChunk):
-                    # Handle text content
-                    if isinstance(chunk.content, str) and chunk.content:
-                        print_streaming_token(chunk.content)
-                    elif isinstance(chunk.content, list):
-                        for item in chunk.content:
-                            if isinstance(item, dict):
-                                if item.get("type") == "text":
-                                    text = item.get("text", "")
-                                    if text:
-                                        print_streaming_token(text)
-
-            elif kind == "on_tool_start":
-                tool_name = event.get("name", "")
-                tool_input: dict[str, Any] = data.get("input", {})
-
-                # End streaming line before tool output
-                print_streaming_end()
-
-                if tool_name == "execute_code":
-                    code = tool_input.get("code", "")
-                    if code:
-                        print_code_execution(code)
-                else:
-                    print_tool_call(tool_name, tool_input)
-
-            elif kind == "on_tool_end":
-                tool_name = event.get("name", "")
-                output = data.get("output", "")
-                run_id = event.get("run_id", "")
-
-                if run_id not in printed_tool_results:
-                    printed_tool_results.add(run_id)
-                    if isinstance(output, str):
-                        print_tool_result(tool_name, output)
-                    else:
-                        print_tool_result(tool_name, str(output))
-
-                # Restart streaming indicator
-                print_streaming_start()
+            handler = get_handler(event["event"])
+            if handler is not None:
+                handler(event, recent_run_ids, buf)
+            else:
+                # Don't hold text back while the agent is busy with other work
+                flush()
+                # Interrupts are emitted as an "__interrupt__" chunk of the root graph
+                if interrupts is not None and event["event"] == "on_chain_stream" and not event.get("parent_ids"):
+                    chunk = event["data"].get("chunk")
+                    if isinstance(chunk, dict) and "__interrupt__" in chunk:
+                        interrupts.extend(chunk["__interrupt__"])
     except KeyboardInterrupt:
         return True
+    finally:
+        flush()
 
     return False
+
+
+async def run_repl(session: PromptSession[str], run_turn: Callable[[str], Awaitable[bool]]) -> None:
+    """Read user input and run agent turns until the user exits.
+
+    Args:
+        session: Prompt session for user input.
+        run_turn: Streams the agent's response to one user input.
+            Returns True if interrupted by user, False otherwise.
+    """
+    while True:
+        try:
+            user_input = await session.prompt_async("> ", multiline=True)
+            user_input = user_input.strip()
+
+            if not user_input:
+                continue
+
+            if user_input.lower() == "/exit":
+                print_info("Goodbye!")
+                break
+
+            console.print()
+            print_streaming_start()
+
+            interrupted = await run_turn(user_input)
+
+            print_streaming_end()
+            console.print()
+
+            if interrupted:
+                console.print("[dim]Interrupted[/dim]")
+                console.print()
+                continue
+
+        except KeyboardInterrupt:
+            print_info("\nGoodbye!")
+            break
+        except EOFError:
+            print_info("\nGoodbye!")
+            break
+        except Exception as e:
+            print_streaming_end()
+            print_error(f"{type(e).__name__}: {e}")
+            console.print()
@@ -1,31 +1,26 @@
 """Direct mode chat loop with dynamic tool filtering."""
 
-from typing import Any, NotRequired, TypedDict
-from uuid import uuid4
+import secrets
+from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
 
-from dotenv import load_dotenv
-from langchain_core.runnables import RunnableConfig
-from langgraph.graph.state import CompiledStateGraph
-from langgraph.types import Command
 from prompt_toolkit import PromptSession
 
-from ..agent import DirectModeAgentFactory
-from ..resume import (
-    _extract_tools_from_messages,
-    aget_messages,
-    aselect_thread_interactive,
-    print_recent_messages,
-)
 from ..ui import (
     console,
-    print_error,
     print_hitl_request,
     print_info,
-    print_streaming_end,
     print_streaming_start,
     print_welcome,
 )
-from .common import create_key_bindings, process_stream_events
+from .common import create_key_bindings, process_stream_events, run_repl
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.graph.state import CompiledStateGraph
+    from langgraph.types import Command
+
+# Agent, checkpointer and LangGraph imports are deferred to the functions that use
+# them, so importing the chat package doesn't load the whole agent stack.
 
 
 class HITLToolConfig(TypedDict):
@@ -40,6 +35,21 @@ HITL_TOOLS: dict[str, HITLToolConfig] = {
     "create_calendar_event": {},  # Always require approval
 }
 
+# HITL decisions are never mutated, so every approval/rejection reuses one dict
+_APPROVE: dict[str, Any] = {"type": "approve"}
+_REJECT: dict[str, Any] = {"type": "reject", "message": "User rejected"}
+
+# Answers accepted as approval at the HITL prompt (anything else rejects)
+_YES = frozenset({"y", "yes"})
+
+# Names of tools that require approval (passed to the agent factory)
+_HITL_NAMES = frozenset(HITL_TOOLS)
+
+# Tool name -> args used as the auto-approval key (None: auto-approve disabled)
+_AUTO_APPROVE_ARGS: dict[str, tuple[str, ...] | None] = {
+    name: config.get("auto_approve") for name, config in HITL_TOOLS.items()
+}
+
 
 def make_approval_key(action: dict[str, Any]) -> tuple[str, ...] | None:
     """Create approval key from action for auto-approve lookup.
@@ -51,14 +61,13 @@ def make_approval_key(action: dict[str, Any]) -> tuple[str, ...] | None:
         Tuple key for approved_calls set, or None if auto-approve is disabled.
     """
     name = action.get("name", "")
-    config = HITL_TOOLS.get(name, {})
-    auto_approve_args = config.get("auto_approve")
+    auto_approve_args = _AUTO_APPROVE_ARGS.get(name)
 
     if auto_approve_args is None:
         return None  # Auto-approve disabled for this tool
 
     args = action.get("args", {})
-    return (name,) + tuple(str(args.get(k, "")) for k in auto_approve_args)
+    return (name, *(str(args.get(k, "")) for k in auto_approve_args))
 
 
 async def prompt_hitl_decisions(
@@ -84,29 +93,27 @@ async def prompt_hitl_decisions(
         # Auto-approve if previously approved
         if key is not None and key in approved_calls:
             print_info(f"Auto-approved: {action.get('name', 'unknown')}")
-            decisions.append({"type": "approve"})
+            decisions.append(_APPROVE)
             continue
 
         # Prompt user
         print_hitl_request(action)
         response = await session.prompt_async("Approve? (y/n): ")
-        response = response.strip().lower()
-
-        if response in ("y", "yes"):
-            decisions.append({"type": "approve"})
+        if response.strip().lower() in _YES:
+            decisions.append(_APPROVE)
             # Remember for auto-approve (if enabled for this tool)
             if key is not None:
                 approved_calls.add(key)
         else:
-            decisions.append({"type": "reject", "message": "User rejected"})
+            decisions.append(_REJECT)
 
     return decisions
 
 
 async def stream_with_hitl(
-    agent: CompiledStateGraph[Any],
-    input_or_command: dict[str, Any] | Command[Any],
-    config: RunnableConfig,
+    agent: "CompiledStateGraph[Any]",
+    input_or_command: "dict[str, Any] | Command[Any]",
+    config: "RunnableConfig",
     session: PromptSession[str],
     approved_calls: set[tuple[str, ...]],
 ) -> bool:
@@ -125,27 +132,26 @@ async def stream_with_hitl(
     Returns:
         True if interrupted by user, False otherwise.
     """
-    interrupted = await process_stream_events(agent.astream_events(input_or_command, config=config, version="v2"))
+    from langgraph.types import Command
+
+    # Interrupts are collected from the stream, so no state read is needed after each turn
+    interrupts: list[Any] = []
+    interrupted = await process_stream_events(
+        agent.astream_events(input_or_command, config=config, version="v2"), interrupts
+    )
 
     if interrupted:
         return True
 
-    state = await agent.aget_state(config)
-
-    if not (state.next and state.tasks):
-        return False
-
-    for task in state.tasks:
-        for intr in task.interrupts:
-            # Handle HITL interrupts
-            if "action_requests" in intr.value:
-                action_requests = intr.value["action_requests"]
-                decisions = await prompt_hitl_decisions(action_requests, session, approved_calls)
+    for intr in interrupts:
+        # Handle HITL interrupts
+        if isinstance(intr.value, dict) and "action_requests" in intr.value:
+            decisions = await prompt_hitl_decisions(intr.value["action_requests"], session, approved_calls)
 
-                print_streaming_start()
-                return await stream_with_hitl(
-                    agent, Command(resume={"decisions": decisions}), config, session, approved_calls
-                )
+            print_streaming_start()
+            return await stream_with_hitl(
+                agent, Command(resume={"decisions": decisions}), config, session, approved_calls
+            )
 
     return False
 
@@ -156,14 +162,24 @@ async def direct_chat_loop(resume: bool = False) -> None:
     Args:
         resume: Whether to show thread selection for resuming.
     """
+    from dotenv import load_dotenv
+
+    from ..agent import CHECKPOINT_DB_PATH, DirectModeAgentFactory
+    from ..resume import (
+        _extract_tools_from_messages,
+        aget_messages,
+        aselect_thread_interactive,
+        print_recent_messages,
+    )
+
     load_dotenv()
     print_welcome("direct")
 
-    async with DirectModeAgentFactory(hitl_tools=set(HITL_TOOLS.keys())) as factory:
+    async with DirectModeAgentFactory(hitl_tools=_HITL_NAMES) as factory:
         # Select thread if resuming
         thread_id: str | None = None
         if resume and factory.checkpointer is not None:
-            thread_id = await aselect_thread_interactive(factory.checkpointer)
+            thread_id = await aselect_thread_interactive(factory.checkpointer, db_path=CHECKPOINT_DB_PATH)
 
         # Restore discovered tools and messages if resuming
         restored_messages: list[Any] = []
@@ -173,10 +189,10 @@ async def direct_chat_loop(resume: bool = False) -> None:
             factory.tool_filter.discovered_tools = restored_tools
 
         # Create agent (all tools registered, middleware filters visibility)
-        agent = factory.create_agent()
+        agent = factory.agent
 
         if thread_id is None:
-            thread_id = str(uuid4())
+            thread_id = secrets.token_hex(16)
             print_info(f"New session: {thread_id[:8]}...")
         else:
             discovered = factory.tool_filter.discovered_tools
@@ -194,44 +210,13 @@ async def direct_chat_loop(resume: bool = False) -> None:
         # Track approved calls for auto-approve (in-memory only)
         approved_calls: set[tuple[str, ...]] = set()
 
-        while True:
-            try:
-                user_input = await session.prompt_async("> ", multiline=True)
-                user_input = user_input.strip()
-
-                if not user_input:
-                    continue
-
-                if user_input.lower() == "/exit":
-                    print_info("Goodbye!")
-                    break
-
-                console.print()
-                print_streaming_start()
-
-                interrupted = await stream_with_hitl(
-                    agent,
-                    {"messages": [{"role": "user", "content": user_input}]},
-                    config,
-                    session,
-                    approved_calls,
-                )
-
-                print_streaming_end()
-                console.print()
-
-                if interrupted:
-                    console.print("[dim]Interrupted[/dim]")
-                    console.print()
-                    continue
-
-            except KeyboardInterrupt:
-                print_info("\nGoodbye!")
-                break
-            except EOFError:
-                print_info("\nGoodbye!")
-                break
-            except Exception as e:
-                print_streaming_end()
-                print_error(f"{type(e).__name__}: {e}")
-                console.print()
+        async def run_turn(user_input: str) -> bool:
+            return await stream_with_hitl(
+                agent,
+                {"messages": [{"role": "user", "content": user_input}]},
+                config,
+                session,
+                approved_calls,
+            )
+
+        await run_repl(session, run_turn)
@@ -1,23 +1,21 @@
 """Programmatic mode chat loop with sandbox execution."""
 
+import secrets
 import sys
-from uuid import uuid4
+from typing import TYPE_CHECKING
 
-from dotenv import load_dotenv
-from langchain_core.runnables import RunnableConfig
 from prompt_toolkit import PromptSession
 
-from ..agent import create_programmatic_agent
-from ..resume import aget_messages, aselect_thread_interactive, print_recent_messages
 from ..ui import (
     console,
     print_error,
     print_info,
-    print_streaming_end,
-    print_streaming_start,
     print_welcome,
 )
-from .common import create_key_bindings, process_stream_events
+from .common import create_key_bindings, process_stream_events, run_repl
+
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
 
 
 async def programmatic_chat_loop(resume: bool = False) -> None:
@@ -26,6 +24,11 @@ async def programmatic_chat_loop(resume: bool = False) -> None:
     Args:
         resume: Whether to show thread selection for resuming.
     """
+    from dotenv import load_dotenv
+
+    from ..agent import CHECKPOINT_DB_PATH, create_programmatic_agent
+    from ..resume import aget_messages, aselect_thread_interactive, print_recent_messages
+
     load_dotenv()
     print_welcome("programmatic")
 
@@ -38,10 +41,10 @@ async def programmatic_chat_loop(resume: bool = False) -> None:
     # Select thread if resuming
     thread_id: str | None = None
     if resume:
-        thread_id = await aselect_thread_interactive(checkpointer)
+        thread_id = await aselect_thread_interactive(checkpointer, db_path=CHECKPOINT_DB_PATH)
 
     if thread_id is None:
-        thread_id = str(uuid4())
+        thread_id = secrets.token_hex(16)
         print_info(f"New session: {thread_id[:8]}...")
     else:
         print_info(f"Resuming session: {thread_id[:8]}...")
@@ -53,45 +56,14 @@ async def programmatic_chat_loop(resume: bool = False) -> None:
     config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
     session: PromptSession[str] = PromptSession(key_bindings=create_key_bindings())
 
-    async with exit_stack:
-        while True:
-            try:
-                user_input = await session.prompt_async("> ", multiline=True)
-                user_input = user_input.strip()
-
-                if not user_input:
-                    continue
-
-                if user_input.lower() == "/exit":
-                    print_info("Goodbye!")
-                    break
+    async def run_turn(user_input: str) -> bool:
+        return await process_stream_events(
+            agent.astream_events(
+                {"messages": [{"role": "user", "content": user_input}]},
+                config=config,
+                version="v2",
+            )
+        )
 
-                console.print()
-                print_streaming_start()
-
-                interrupted = await process_stream_events(
-                    agent.astream_events(
-                        {"messages": [{"role": "user", "content": user_input}]},
-                        config=config,
-                        version="v2",
-                    )
-                )
-
-                print_streaming_end()
-                console.print()
-
-                if interrupted:
-                    console.print("[dim]Interrupted[/dim]")
-                    console.print()
-                    continue
-
-            except KeyboardInterrupt:
-                print_info("\nGoodbye!")
-                break
-            except EOFError:
-                print_info("\nGoodbye!")
-                break
-            except Exception as e:
-                print_streaming_end()
-                print_error(f"{type(e).__name__}: {e}")
-                console.print()
+    async with exit_stack:
+        await run_repl(session, run_turn)
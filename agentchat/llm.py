@@ -1,11 +1,24 @@
 """LLM provider configuration and factory."""
 
+import json
 import os
-from typing import Literal, cast
-
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal, cast
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import SystemMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
 
 LLMProvider = Literal["anthropic", "bedrock"]
+LLMCacheMode = Literal["off", "exact"]
+
+LLM_CACHE_DB_PATH = Path(__file__).parent.parent / "tmp" / "llm_cache.db"
 
 DEFAULT_MODELS: dict[LLMProvider, str] = {
     "anthropic": "claude-sonnet-4-5-20250929",
@@ -13,6 +26,8 @@ DEFAULT_MODELS: dict[LLMProvider, str] = {
 }
 
 
+# Env-derived settings are read once per process (after load_dotenv in the chat loops)
+@lru_cache(maxsize=1)
 def get_provider() -> LLMProvider:
     """Get LLM provider from LLM_PROVIDER env var. Default: anthropic."""
     provider = os.environ.get("LLM_PROVIDER", "anthropic").lower()
@@ -21,6 +36,7 @@ def get_provider() -> LLMProvider:
     return cast(LLMProvider, provider)
 
 
+@lru_cache(maxsize=4)
 def get_default_model(provider: LLMProvider | None = None) -> str:
     """Get default model for provider. MODEL_ID env var overrides."""
     if provider is None:
@@ -28,6 +44,102 @@ def get_default_model(provider: LLMProvider | None = None) -> str:
     return os.environ.get("MODEL_ID") or DEFAULT_MODELS[provider]
 
 
+@lru_cache(maxsize=1)
+def get_llm_cache_mode() -> LLMCacheMode:
+    """Get LLM response cache mode from AGENTCHAT_LLM_CACHE env var. Default: off."""
+    mode = os.environ.get("AGENTCHAT_LLM_CACHE", "off").lower()
+    if mode not in ("off", "exact"):
+        raise ValueError(f"Invalid AGENTCHAT_LLM_CACHE: {mode}. Must be 'off' or 'exact'.")
+    return cast(LLMCacheMode, mode)
+
+
+class SQLiteLLMCache(BaseCache):
+    """Exact-match LLM response cache persisted in SQLite.
+
+    Entries are keyed by the serialized prompt and the model's llm_string, which
+    includes the model name, parameters and bound tool schemas, so a response is
+    only reused for an identical request. Only chat generations are stored, as
+    message dicts. Entries expire after `ttl` seconds; when more than
+    `max_entries` are stored, the oldest entries are evicted.
+    """
+
+    def __init__(self, db_path: Path = LLM_CACHE_DB_PATH, *, ttl: float = 7 * 86400.0, max_entries: int = 4096) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Async lookups run in executor threads, so each thread gets its own connection
+        self._local = threading.local()
+        conn = self._connect()
+        with conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(llm_cache)")}
+            if columns and "created_at" not in columns:
+                # Entries from before expiry was tracked cannot be aged out
+                conn.execute("DROP TABLE llm_cache")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(prompt TEXT NOT NULL, llm_string TEXT NOT NULL, idx INTEGER NOT NULL, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (prompt, llm_string, idx))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_path)
+        return conn
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Look up cached generations for a prompt."""
+        cursor = self._connect().execute(
+            "SELECT response FROM llm_cache WHERE prompt = ? AND llm_string = ? AND created_at > ? ORDER BY idx",
+            (prompt, llm_string, time.time() - self.ttl),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+        return [ChatGeneration(message=msg) for msg in messages_from_dict([json.loads(row[0]) for row in rows])]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """Store generations for a prompt, evicting expired and the oldest entries if over capacity."""
+        if not all(isinstance(gen, ChatGeneration) for gen in return_val):
+            return
+        now = time.time()
+        rows = [
+            (prompt, llm_string, i, json.dumps(message_to_dict(cast(ChatGeneration, gen).message)), now)
+            for i, gen in enumerate(return_val)
+        ]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache WHERE prompt = ? AND llm_string = ?", (prompt, llm_string))
+            conn.executemany("INSERT INTO llm_cache VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,))
+            # Evict whole entries (all generations of a prompt), keyed by their first generation
+            conn.execute(
+                "DELETE FROM llm_cache WHERE (prompt, llm_string) IN "
+                "(SELECT prompt, llm_string FROM llm_cache WHERE idx = 0 ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete all cached responses."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+
+# Lazy-initialized response cache (shared by all models)
+_llm_cache: BaseCache | None = None
+
+
+def get_llm_cache() -> BaseCache | None:
+    """Get the LLM response cache for the configured mode, or None if disabled."""
+    global _llm_cache
+    if get_llm_cache_mode() == "off":
+        return None
+    if _llm_cache is None:
+        _llm_cache = SQLiteLLMCache()
+    return _llm_cache
+
+
 def create_chat_model(
     model_name: str | None = None,
     provider: LLMProvider | None = None,
@@ -52,12 +164,33 @@ def create_chat_model(
     if provider == "anthropic":
         from langchain_anthropic import ChatAnthropic
 
-        return ChatAnthropic(model=model_name)
+        return ChatAnthropic(model=model_name, cache=get_llm_cache())
 
     elif provider == "bedrock":
         from langchain_aws import ChatBedrockConverse
 
         region = os.environ.get("AWS_REGION") or os.environ.get("AWS_DEFAULT_REGION")
-        return ChatBedrockConverse(model_id=model_name, region_name=region)
+        return ChatBedrockConverse(model_id=model_name, region_name=region, cache=get_llm_cache())
 
     raise ValueError(f"Unknown provider: {provider}")
+
+
+def cacheable_system_prompt(prompt: str, model: BaseChatModel) -> str | SystemMessage:
+    """Mark a static system prompt as cacheable for providers that support it.
+
+    For ChatAnthropic, the prompt becomes a text block with an ephemeral
+    cache_control breakpoint. Anthropic caches the request prefix up to the
+    breakpoint (tool definitions + system prompt), so later turns reuse it.
+
+    Args:
+        prompt: System prompt text.
+        model: Chat model the prompt will be sent to.
+
+    Returns:
+        SystemMessage with cache_control for Anthropic, otherwise the plain prompt.
+    """
+    from langchain_anthropic import ChatAnthropic
+
+    if not isinstance(model, ChatAnthropic):
+        return prompt
+    return SystemMessage(content=[{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}])
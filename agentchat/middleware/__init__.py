@@ -1,12 +1,14 @@
 """Middleware for agent functionality."""
 
 from .logging import TokenUsageLoggingMiddleware
-from .suggest import IndexConfig, SuggestMiddleware
+from .suggest import IndexConfig, SuggestionStore, SuggestMiddleware, get_suggest_cache_mode
 from .tool_filter import ToolSearchFilterMiddleware
 
 __all__ = [
     "IndexConfig",
     "SuggestMiddleware",
+    "SuggestionStore",
     "TokenUsageLoggingMiddleware",
     "ToolSearchFilterMiddleware",
+    "get_suggest_cache_mode",
 ]
@@ -1,5 +1,8 @@
 """Logging middleware for token usage tracking."""
 
+import logging
+import os
+from functools import lru_cache
 from typing import Any
 
 import rich
@@ -7,14 +10,40 @@ from langchain.agents.middleware.types import (
     AgentMiddleware,
     AgentState,
 )
+from rich.text import Text
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def is_debug_enabled() -> bool:
+    """Check AGENTCHAT_DEBUG env var (1/true/yes prints the visible tools on every model call)."""
+    return os.environ.get("AGENTCHAT_DEBUG", "").lower() in ("1", "true", "yes")
+
+
+# Usage line templates (printed as styled Text, so rich skips markup parsing)
+_USAGE_FORMAT = "\nTokens: %d in / %d out"
+_USAGE_CACHED_FORMAT = "\nTokens: %d in (cache: %d read, %d written) / %d out"
 
 
 class TokenUsageLoggingMiddleware(AgentMiddleware[AgentState[Any], Any]):
     """Middleware that logs token usage for each model call."""
 
+    def __init__(self, verbose: bool = True) -> None:
+        """Initialize middleware.
+
+        Args:
+            verbose: Print token usage after every model call. If False, it is
+                only logged at DEBUG level.
+        """
+        self.verbose = verbose
+
     def after_model(self, state: AgentState[Any], runtime: Any) -> dict[str, Any] | None:  # noqa: ARG002
         """Log token usage after model call."""
         # Get the last message from state which contains usage metadata
+        if not self.verbose and not logger.isEnabledFor(logging.DEBUG):
+            return None
+
         messages = state.get("messages", [])
         if messages:
             last_msg = messages[-1]
@@ -26,10 +55,15 @@ class TokenUsageLoggingMiddleware(AgentMiddleware[AgentState[Any], Any]):
                 # Check for cache usage
                 input_details = usage.get("input_token_details", {})
                 cache_read = input_details.get("cache_read", 0)
+                cache_creation = input_details.get("cache_creation", 0)
 
-                if cache_read:
-                    rich.print(f"\n[dim]Tokens: {input_tokens} in (cache: {cache_read}) / {output_tokens} out[/dim]")
+                if cache_read or cache_creation:
+                    line = _USAGE_CACHED_FORMAT % (input_tokens, cache_read, cache_creation, output_tokens)
+                else:
+                    line = _USAGE_FORMAT % (input_tokens, output_tokens)
+                if self.verbose:
+                    rich.print(Text(line, style="dim"))
                 else:
-                    rich.print(f"\n[dim]Tokens: {input_tokens} in / {output_tokens} out[/dim]")
+                    logger.debug(line.lstrip())
 
         return None
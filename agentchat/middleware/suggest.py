@@ -1,9 +1,21 @@
 """Unified suggestion middleware for automatic recommendations."""
 
+import asyncio
+import heapq
+import logging
+import os
+import re
+import sqlite3
+import time
+from collections import OrderedDict
 from collections.abc import Awaitable, Callable, Sequence
+from contextlib import closing
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Literal, cast
 
+import numpy as np
 import rich
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -12,11 +24,14 @@ from langchain.agents.middleware.types import (
     ModelResponse,
 )
 from langchain_core.messages import HumanMessage, SystemMessage
+from numpy.typing import NDArray
 
-from ..tools.embeddings import SearchableIndex
+from ..tools.embeddings import SearchableIndex, encode_query
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class IndexConfig:
     """Configuration for a searchable index in the suggestion middleware."""
 
@@ -28,6 +43,120 @@ class IndexConfig:
 _SUGGEST_START = "[SUGGESTIONS]"
 _SUGGEST_END = "[/SUGGESTIONS]"
 
+# A suggestion block with its surrounding whitespace
+_SUGGEST_BLOCK = re.compile(rf"\s*{re.escape(_SUGGEST_START)}.*?{re.escape(_SUGGEST_END)}\s*", re.DOTALL)
+_SUGGEST_HEADER = f"{_SUGGEST_START}\nSuggested items based on user's request:"
+
+# Number of recent user messages whose suggestions are kept
+_SUGGESTION_CACHE_SIZE = 32
+
+# Number of recent user message embeddings compared against for paraphrases
+_SEMANTIC_CACHE_SIZE = 64
+
+# Default path for suggestions persisted across sessions
+SUGGEST_CACHE_DB_PATH = Path(__file__).parent.parent.parent / "tmp" / "suggest_cache.db"
+
+SuggestCacheMode = Literal["memory", "persist"]
+
+
+@lru_cache(maxsize=1)
+def get_suggest_cache_mode() -> SuggestCacheMode:
+    """Get suggestion cache mode from AGENTCHAT_SUGGEST_CACHE env var. Default: memory."""
+    mode = os.environ.get("AGENTCHAT_SUGGEST_CACHE", "memory").lower()
+    if mode not in ("memory", "persist"):
+        raise ValueError(f"Invalid AGENTCHAT_SUGGEST_CACHE: {mode}. Must be 'memory' or 'persist'.")
+    return cast(SuggestCacheMode, mode)
+
+
+def _message_marker(msg: Any) -> object:
+    """Identify a message: its ID if set (stable across checkpoints), else the object itself."""
+    return getattr(msg, "id", None) or id(msg)
+
+
+def _find_latest_user_text(messages: Sequence[Any], start: int = 0) -> str | None:
+    """Get the text of the last HumanMessage in messages[start:] that has any."""
+    for i in range(len(messages) - 1, start - 1, -1):
+        msg = messages[i]
+        if isinstance(msg, HumanMessage):
+            content = msg.content
+            if isinstance(content, str):
+                return content
+            if isinstance(content, list):
+                # First text block, if any (otherwise keep looking at earlier messages)
+                text: str | None = next(
+                    (
+                        item["text"]
+                        for item in content
+                        if isinstance(item, dict) and item.get("type") == "text" and isinstance(item.get("text"), str)
+                    ),
+                    None,
+                )
+                if text is not None:
+                    return text
+    return None
+
+
+class SuggestionStore:
+    """SQLite store of user message embeddings and their suggestion text.
+
+    Lets a new session reuse suggestions for messages similar to ones from
+    earlier sessions. Each entry records the fingerprint of the indexes it was
+    searched in, and is only reused while they are unchanged. Entries older
+    than `ttl` seconds are ignored, and only the newest `max_entries` are kept.
+    """
+
+    def __init__(self, db_path: Path = SUGGEST_CACHE_DB_PATH, *, ttl: float = 86400.0, max_entries: int = 256) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        with closing(self._connect()) as conn, conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(suggestions)")}
+            if columns and "fingerprint" not in columns:
+                # Entries from before fingerprints were stored cannot be matched to an index
+                conn.execute("DROP TABLE suggestions")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS suggestions (embedding BLOB NOT NULL, suggestion TEXT NOT NULL, "
+                "fingerprint TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def load(self, dims: int, fingerprint: str, limit: int) -> list[tuple[NDArray[np.float32], str]]:
+        """Get the newest unexpired entries for the given indexes, oldest first.
+
+        Args:
+            dims: Embedding dimensionality (entries from other models are skipped).
+            fingerprint: Fingerprint of the searched indexes (entries from other
+                tool or skill sets are skipped).
+            limit: Maximum number of entries.
+
+        Returns:
+            (normalized embedding, suggestion text) pairs.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT embedding, suggestion FROM suggestions "
+                "WHERE length(embedding) = ? AND fingerprint = ? AND created_at > ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (dims * 4, fingerprint, time.time() - self.ttl, limit),
+            ).fetchall()
+        return [(np.frombuffer(embedding, dtype=np.float32), suggestion) for embedding, suggestion in reversed(rows)]
+
+    def add(self, vector: NDArray[np.float32], suggestion_text: str, fingerprint: str) -> None:
+        """Store an entry, evicting the oldest entries if over capacity."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO suggestions VALUES (?, ?, ?, ?)",
+                (vector.astype(np.float32).tobytes(), suggestion_text, fingerprint, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM suggestions WHERE rowid IN "
+                "(SELECT rowid FROM suggestions ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
 
 class SuggestMiddleware(AgentMiddleware[AgentState[Any], Any]):
     """Middleware that suggests relevant items from multiple indexes.
@@ -36,32 +165,70 @@ class SuggestMiddleware(AgentMiddleware[AgentState[Any], Any]):
     merges results by score, and injects top-k suggestions into the system prompt.
     """
 
-    def __init__(self, indexes: list[IndexConfig], top_k: int = 5):
+    def __init__(
+        self,
+        indexes: list[IndexConfig],
+        top_k: int = 5,
+        verbose: bool = True,
+        similarity_threshold: float | None = 0.92,
+        store: SuggestionStore | None = None,
+    ):
         """Initialize middleware.
 
         Args:
             indexes: List of index configurations.
             top_k: Total number of items to suggest across all indexes.
+            verbose: Print suggestions when they change. If False, they are
+                only logged at DEBUG level.
+            similarity_threshold: Reuse the suggestions of a recent user message whose
+                query embedding has at least this cosine similarity. None disables it.
+            store: Persist message embeddings and suggestions here, so that later
+                sessions can reuse them (requires similarity_threshold).
         """
         self.indexes = indexes
         self.top_k = top_k
+        self.similarity_threshold = similarity_threshold
+        self.store = store
+        self.verbose = verbose
+        # Fixed parts of the suggestion text, per index
+        self._line_prefixes = {cfg.label: f"- [{cfg.label}] " for cfg in indexes}
+        self._usage_hints = [(cfg.label, f"{cfg.usage_hint}\n") for cfg in indexes if cfg.usage_hint]
         self._index_available: dict[str, bool | None] = {cfg.label: None for cfg in indexes}
-        self._last_user_message: str | None = None
+        # (length, last message marker) of the last scanned history, and its latest user text
+        self._scanned: tuple[int, object] | None = None
+        self._latest_user_text: str | None = None
+        # (hash, length) of the last processed user message
+        self._last_user_key: tuple[int, int] | None = None
+        # Suggestion text for recent user messages, keyed by (hash, length)
+        self._suggestion_cache: OrderedDict[tuple[int, int], str] = OrderedDict()
+        # Ring buffer of normalized embeddings of recent user messages and their suggestion text
+        self._recent_vectors: NDArray[np.float32] | None = None
+        self._recent_texts: list[str] = []
+        self._recent_slot = 0
+        # Fingerprint of the indexes the recent suggestions were searched in
+        self._recent_fingerprint: str | None = None
+        self._store_loaded = store is None
 
     def _get_latest_user_message(self, messages: Sequence[Any]) -> str | None:
-        """Extract the latest user message content."""
-        for msg in reversed(messages):
-            if isinstance(msg, HumanMessage):
-                content = msg.content
-                if isinstance(content, str):
-                    return content
-                if isinstance(content, list):
-                    for item in content:
-                        if isinstance(item, dict) and item.get("type") == "text":
-                            text = item.get("text")
-                            if isinstance(text, str):
-                                return text
-        return None
+        """Extract the latest user message content.
+
+        Only messages appended since the previous call are scanned, as long as
+        the history up to there is unchanged (checked via the last message seen).
+        """
+        start = 0
+        if self._scanned is not None:
+            scanned_len, marker = self._scanned
+            if scanned_len <= len(messages) and _message_marker(messages[scanned_len - 1]) == marker:
+                start = scanned_len
+
+        text = _find_latest_user_text(messages, start)
+        if text is None and start:
+            text = self._latest_user_text
+
+        if messages:
+            self._scanned = (len(messages), _message_marker(messages[-1]))
+        self._latest_user_text = text
+        return text
 
     async def _search_index(
         self, config: IndexConfig, query: str, limit: int
@@ -87,43 +254,27 @@ class SuggestMiddleware(AgentMiddleware[AgentState[Any], Any]):
         if not items:
             return ""
 
-        lines = [_SUGGEST_START, "Suggested items based on user's request:"]
-
-        # Track which labels appear in results
-        labels_used: set[str] = set()
-
-        for config, item in items:
-            labels_used.add(config.label)
-            name = item.get("name", "?")
-            desc = item.get("description", "")
-            lines.append(f"- [{config.label}] {name}: {desc}")
+        line_prefixes = self._line_prefixes
+        body = "\n".join(
+            f"{line_prefixes[config.label]}{item.get('name', '?')}: {item.get('description', '')}"
+            for config, item in items
+        )
 
         # Add hints for labels that appear in results
-        lines.append("")
-        for config in self.indexes:
-            if config.label in labels_used and config.usage_hint:
-                lines.append(config.usage_hint)
+        labels_used = {config.label for config, _ in items}
+        hints = "".join(hint for label, hint in self._usage_hints if label in labels_used)
 
-        lines.append(_SUGGEST_END)
-        return "\n".join(lines)
+        return f"{_SUGGEST_HEADER}\n{body}\n\n{hints}{_SUGGEST_END}"
 
     def _remove_old_suggestions(self, content: str) -> str:
         """Remove existing suggestion block from content."""
-        start_idx = content.find(_SUGGEST_START)
-        if start_idx == -1:
-            return content
-
-        end_idx = content.find(_SUGGEST_END)
-        if end_idx == -1:
-            return content
+        cleaned, count = _SUGGEST_BLOCK.subn("\n\n", content, count=1)
+        return cleaned.strip() if count else content
 
-        end_idx += len(_SUGGEST_END)
-        before = content[:start_idx].rstrip()
-        after = content[end_idx:].lstrip()
-
-        if before and after:
-            return f"{before}\n\n{after}"
-        return before or after
+    def _is_suggestion_block(self, block: str | dict[str, Any]) -> bool:
+        """Check if a system message content block is a suggestion block."""
+        text = block if isinstance(block, str) else block.get("text")
+        return isinstance(text, str) and text.startswith(_SUGGEST_START)
 
     def _update_system_message(
         self, system_message: SystemMessage | None, suggestion_text: str
@@ -134,13 +285,23 @@ class SuggestMiddleware(AgentMiddleware[AgentState[Any], Any]):
                 return SystemMessage(content=suggestion_text)
             return None
 
-        content = system_message.content if isinstance(system_message.content, str) else str(system_message.content)
-        clean_content = self._remove_old_suggestions(content)
-
-        if suggestion_text:
-            new_content = f"{clean_content}\n\n{suggestion_text}"
+        new_content: str | list[str | dict[str, Any]]
+        if isinstance(system_message.content, list):
+            # Structured prompt (e.g. with cache_control): keep its blocks intact so the
+            # cached prefix is unchanged, and put suggestions in a trailing block
+            new_content = [block for block in system_message.content if not self._is_suggestion_block(block)]
+            if suggestion_text:
+                new_content.append({"type": "text", "text": suggestion_text})
         else:
-            new_content = clean_content
+            clean_content = self._remove_old_suggestions(system_message.content)
+            if suggestion_text:
+                new_content = f"{clean_content}\n\n{suggestion_text}"
+            else:
+                new_content = clean_content
+
+        # Unchanged: keep the same message so nothing downstream sees a new prompt
+        if new_content == system_message.content:
+            return system_message
 
         return SystemMessage(
             content=new_content,
@@ -155,31 +316,135 @@ class SuggestMiddleware(AgentMiddleware[AgentState[Any], Any]):
         if not user_msg:
             return request
 
-        if user_msg == self._last_user_message:
+        key = (hash(user_msg), len(user_msg))
+        if key == self._last_user_key:
             return request
 
-        self._last_user_message = user_msg
+        self._last_user_key = key
 
-        # Search all indexes and collect results
-        all_results: list[tuple[IndexConfig, dict[str, Any]]] = []
-        for config in self.indexes:
-            results = await self._search_index(config, user_msg, self.top_k)
-            all_results.extend(results)
+        suggestion_text = self._suggestion_cache.get(key)
+        if suggestion_text is None:
+            suggestion_text = await self._get_suggestions(user_msg)
+            self._suggestion_cache[key] = suggestion_text
+            if len(self._suggestion_cache) > _SUGGESTION_CACHE_SIZE:
+                self._suggestion_cache.popitem(last=False)
 
-        # Sort by score (higher is better) and take top-k
-        all_results.sort(key=lambda x: x[1].get("score", 0), reverse=True)
-        top_items = all_results[: self.top_k]
+        new_system = self._update_system_message(request.system_message, suggestion_text)
+        if new_system is request.system_message:
+            return request
+        return request.override(system_message=new_system)
+
+    def _encode(self, user_msg: str) -> NDArray[np.float32] | None:
+        """Get the normalized query embedding of a user message, or None if unavailable."""
+        if self.similarity_threshold is None:
+            return None
+        try:
+            vector = encode_query(user_msg)
+        except Exception:  # noqa: BLE001
+            # The index searches report the failure
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
 
-        if top_items:
+    def _index_fingerprint(self) -> str | None:
+        """Get a combined fingerprint of all indexes, or None if any is unavailable."""
+        try:
+            fingerprints = [(cfg.label, cfg.index.fingerprint) for cfg in self.indexes]
+        except Exception:  # noqa: BLE001
+            # The index searches report the failure
+            return None
+        return ",".join(f"{label}:{fingerprint or ''}" for label, fingerprint in fingerprints)
+
+    def _reset_recent(self, fingerprint: str) -> None:
+        """Forget recent suggestions searched in other indexes, and reload those for these from the store."""
+        self._recent_fingerprint = fingerprint
+        self._recent_texts.clear()
+        self._recent_slot = 0
+        self._store_loaded = self.store is None
+
+    async def _find_similar(self, vector: NDArray[np.float32], fingerprint: str) -> str | None:
+        """Get the suggestion text of the most similar recent user message above the threshold."""
+        if fingerprint != self._recent_fingerprint:
+            self._reset_recent(fingerprint)
+        if not self._store_loaded:
+            self._store_loaded = True
+            await self._load_stored(len(vector), fingerprint)
+        if not self._recent_texts or self._recent_vectors is None or self.similarity_threshold is None:
+            return None
+        similarities = self._recent_vectors[: len(self._recent_texts)] @ vector
+        best = int(similarities.argmax())
+        return self._recent_texts[best] if similarities[best] >= self.similarity_threshold else None
+
+    async def _load_stored(self, dims: int, fingerprint: str) -> None:
+        """Fill the recent embeddings with entries from earlier sessions."""
+        if self.store is None:
+            return
+        try:
+            # SQLite file I/O, kept off the event loop
+            entries = await asyncio.to_thread(self.store.load, dims, fingerprint, _SEMANTIC_CACHE_SIZE)
+        except sqlite3.Error as e:
+            logger.warning("Failed to load stored suggestions: %s", e)
+            return
+        for vector, suggestion_text in entries:
+            self._remember(vector, suggestion_text)
+
+    async def _persist(self, vector: NDArray[np.float32], suggestion_text: str, fingerprint: str) -> None:
+        """Store a user message embedding and its suggestion text for later sessions."""
+        if self.store is None:
+            return
+        try:
+            await asyncio.to_thread(self.store.add, vector, suggestion_text, fingerprint)
+        except sqlite3.Error as e:
+            logger.warning("Failed to store suggestions: %s", e)
+
+    def _remember(self, vector: NDArray[np.float32], suggestion_text: str) -> None:
+        """Keep a user message embedding and its suggestion text, replacing the oldest when full."""
+        if self._recent_vectors is None:
+            self._recent_vectors = np.empty((_SEMANTIC_CACHE_SIZE, len(vector)), dtype=np.float32)
+        slot = self._recent_slot
+        self._recent_vectors[slot] = vector
+        if slot < len(self._recent_texts):
+            self._recent_texts[slot] = suggestion_text
+        else:
+            self._recent_texts.append(suggestion_text)
+        self._recent_slot = (slot + 1) % _SEMANTIC_CACHE_SIZE
+
+    async def _get_suggestions(self, user_msg: str) -> str:
+        """Get suggestion text, reusing that of a paraphrased recent message if there is one."""
+        vector = self._encode(user_msg)
+        fingerprint = self._index_fingerprint() if vector is not None else None
+        if vector is not None and fingerprint is not None:
+            suggestion_text = await self._find_similar(vector, fingerprint)
+            if suggestion_text is not None:
+                logger.debug("Reusing suggestions of a similar message")
+                return suggestion_text
+
+        suggestion_text = await self._search_suggestions(user_msg)
+        if vector is not None and fingerprint is not None:
+            self._remember(vector, suggestion_text)
+            await self._persist(vector, suggestion_text, fingerprint)
+        return suggestion_text
+
+    async def _search_suggestions(self, user_msg: str) -> str:
+        """Search all indexes, merge by score, and build the suggestion text."""
+        # Search all indexes concurrently and collect results (in index order)
+        searches = await asyncio.gather(*(self._search_index(config, user_msg, self.top_k) for config in self.indexes))
+        all_results = [result for results in searches for result in results]
+
+        # Take top-k by score (higher is better)
+        top_items = heapq.nlargest(self.top_k, all_results, key=lambda x: x[1].get("score", 0))
+
+        if top_items and (self.verbose or logger.isEnabledFor(logging.DEBUG)):
             log_items = [
                 (f"[{cfg.label}] {item.get('name', '?')}", f"{item.get('score', 0):.2f}")
                 for cfg, item in top_items
             ]
-            rich.print(f"[cyan]Suggestions: {log_items}[/cyan]")
+            if self.verbose:
+                rich.print(f"[cyan]Suggestions: {log_items}[/cyan]")
+            else:
+                logger.debug("Suggestions: %s", log_items)
 
-        suggestion_text = self._build_suggestion_text(top_items)
-        new_system = self._update_system_message(request.system_message, suggestion_text)
-        return request.override(system_message=new_system)
+        return self._build_suggestion_text(top_items)
 
     async def awrap_model_call(
         self,
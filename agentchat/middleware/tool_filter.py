@@ -1,9 +1,11 @@
 """Tool filtering middleware for dynamic tool discovery."""
 
-import json
-from collections.abc import Awaitable, Callable, Sequence
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Sequence
 from typing import Any
 
+import orjson
 import rich
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -16,6 +18,65 @@ from langchain_core.tools import BaseTool
 from langgraph.prebuilt.tool_node import ToolCallRequest
 from langgraph.types import Command
 
+from .logging import is_debug_enabled
+
+logger = logging.getLogger(__name__)
+
+# Search results larger than this (in characters) are parsed off the event loop
+_THREADED_PARSE_MIN_SIZE = 65536
+
+
+def _extract_tool_names(content: Any) -> frozenset[str]:
+    """Extract tool names from a decoded search tool result.
+
+    Entries are assumed to be dicts; the checked path only runs if one is not.
+    """
+    try:
+        # Format: {"tools": [...]} for tool_search/tool_search_regex
+        tools_list = content.get("tools")
+        # Format: {"results": [...]} for search_tools_or_skills (never combined with "tools")
+        results_list = content.get("results") if tools_list is None else None
+    except AttributeError:  # Not a dict
+        return frozenset()
+
+    if isinstance(tools_list, list):
+        try:
+            return frozenset({name for t in tools_list if isinstance(name := t.get("name"), str)})
+        except AttributeError:
+            return frozenset({t["name"] for t in tools_list if isinstance(t, dict) and isinstance(t.get("name"), str)})
+
+    if isinstance(results_list, list):
+        # Only type="tool" results are tools
+        try:
+            return frozenset(
+                {name for r in results_list if r.get("type") == "tool" and isinstance(name := r.get("name"), str)}
+            )
+        except AttributeError:
+            return frozenset(
+                {
+                    r["name"]
+                    for r in results_list
+                    if isinstance(r, dict) and r.get("type") == "tool" and isinstance(r.get("name"), str)
+                }
+            )
+
+    return frozenset()
+
+
+def _parse_tool_names(content: str) -> frozenset[str]:
+    """Parse a JSON search tool result and extract tool names."""
+    try:
+        return _extract_tool_names(orjson.loads(content))
+    except orjson.JSONDecodeError:
+        return frozenset()
+
+
+def _get_result_tool_names(content: Any) -> frozenset[str]:
+    """Extract tool names from search tool result content (JSON string or decoded)."""
+    if isinstance(content, str):
+        return _parse_tool_names(content)
+    return _extract_tool_names(content)
+
 
 class ToolSearchFilterMiddleware(AgentMiddleware[AgentState[Any], Any]):
     """Middleware that filters tools based on search tool results.
@@ -26,23 +87,42 @@ class ToolSearchFilterMiddleware(AgentMiddleware[AgentState[Any], Any]):
     """
 
     # Tools that are always visible (meta-tools for discovery)
-    ALWAYS_VISIBLE = {
-        "tool_search",
-        "tool_search_regex",
-        "enable_tool",
-        "search_skills",
-        "get_skill",
-        "search_tools_or_skills",
-    }
-
-    def __init__(self, tool_registry: dict[str, BaseTool]):
+    ALWAYS_VISIBLE = frozenset(
+        {
+            "tool_search",
+            "tool_search_regex",
+            "enable_tool",
+            "search_skills",
+            "get_skill",
+            "search_tools_or_skills",
+        }
+    )
+
+    def __init__(self, tool_registry: dict[str, BaseTool], verbose: bool | None = None):
         """Initialize middleware.
 
         Args:
             tool_registry: Registry of all available tools.
+            verbose: Print visible tools on every model call. If False, they are
+                only logged at DEBUG level. Default: AGENTCHAT_DEBUG.
         """
         self.tool_registry = tool_registry
-        self.discovered_tools: set[str] = set()
+        # Registry names as a frozenset for fast intersection (the registry is a fixed snapshot)
+        self._registry_names = frozenset(tool_registry)
+        self.verbose = is_debug_enabled() if verbose is None else verbose
+        self._discovered_tools: frozenset[str] = frozenset()
+        # ALWAYS_VISIBLE | discovered tools, rebuilt whenever the discovered tools change
+        self._allowed = self.ALWAYS_VISIBLE
+
+    @property
+    def discovered_tools(self) -> frozenset[str]:
+        """Tools discovered so far (assign a new set to replace them)."""
+        return self._discovered_tools
+
+    @discovered_tools.setter
+    def discovered_tools(self, tools: Iterable[str]) -> None:
+        self._discovered_tools = frozenset(tools)
+        self._allowed = self.ALWAYS_VISIBLE | self._discovered_tools
 
     def _get_tool_name(self, t: BaseTool | dict[str, Any]) -> str:
         """Get tool name from BaseTool or dict."""
@@ -54,15 +134,23 @@ class ToolSearchFilterMiddleware(AgentMiddleware[AgentState[Any], Any]):
         """Extract tool names from a list of tools."""
         return [self._get_tool_name(t) for t in tools]
 
-    def _filter_tools(self, tools: Sequence[BaseTool | dict[str, Any]]) -> list[BaseTool | dict[str, Any]]:
-        """Filter tools to show only always-visible + discovered tools."""
-        filtered: list[BaseTool | dict[str, Any]] = []
-        for t in tools:
-            name = self._get_tool_name(t)
-            # Always include meta-tools, plus discovered tools
-            if name in self.ALWAYS_VISIBLE or name in self.discovered_tools:
-                filtered.append(t)
-        return filtered
+    def _filter_tools(self, tools: list[BaseTool | dict[str, Any]]) -> list[BaseTool | dict[str, Any]]:
+        """Filter tools to show only always-visible + discovered tools.
+
+        Returns the input list itself if every tool is visible.
+        """
+        get_name = self._get_tool_name
+        # Always include meta-tools, plus discovered tools
+        allowed = self._allowed
+        filtered = [t for t in tools if get_name(t) in allowed]
+        return tools if len(filtered) == len(tools) else filtered
+
+    def _log_visible_tools(self, tools: Sequence[BaseTool | dict[str, Any]]) -> None:
+        """Report the tools visible to the model (only builds the list if it will be shown)."""
+        if self.verbose:
+            rich.print(f"[dim]Visible tools: {self._get_tool_names(tools)}[/dim]")
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Visible tools: %s", self._get_tool_names(tools))
 
     def wrap_model_call(
         self,
@@ -71,8 +159,9 @@ class ToolSearchFilterMiddleware(AgentMiddleware[AgentState[Any], Any]):
     ) -> ModelResponse:
         """Filter tools to only show discovery tools + discovered tools (sync)."""
         filtered = self._filter_tools(request.tools)
-        rich.print(f"[dim]Visible tools: {self._get_tool_names(filtered)}[/dim]")
-        request = request.override(tools=filtered)
+        self._log_visible_tools(filtered)
+        if filtered is not request.tools:
+            request = request.override(tools=filtered)
         return handler(request)
 
     async def awrap_model_call(
@@ -82,55 +171,51 @@ class ToolSearchFilterMiddleware(AgentMiddleware[AgentState[Any], Any]):
     ) -> ModelResponse:
         """Filter tools to only show discovery tools + discovered tools (async)."""
         filtered = self._filter_tools(request.tools)
-        rich.print(f"[dim]Visible tools: {self._get_tool_names(filtered)}[/dim]")
-        request = request.override(tools=filtered)
+        self._log_visible_tools(filtered)
+        if filtered is not request.tools:
+            request = request.override(tools=filtered)
         return await handler(request)
 
-    def _process_tool_search_result(self, request: ToolCallRequest, result: Any) -> None:
-        """Process tool search results to track discovered tools."""
+    def _search_result_content(self, request: ToolCallRequest, result: Any) -> Any:
+        """Get the content of a search tool result, or None for other tools."""
         tool_name = request.tool.name if request.tool else ""
         if tool_name not in ("tool_search", "tool_search_regex", "enable_tool", "search_tools_or_skills"):
-            return
+            return None
 
-        # Extract tool names from the result
         # result.content may be a dict (native) or JSON string
-        content = result.content if hasattr(result, "content") else result
-
-        tool_names: set[str] = set()
-
-        # Parse JSON string if needed
-        if isinstance(content, str):
-            try:
-                content = json.loads(content)
-            except json.JSONDecodeError:
-                pass
-
-        if isinstance(content, dict):
-            # Format: {"tools": [...]} for tool_search/tool_search_regex
-            tools_list = content.get("tools", [])
-            if isinstance(tools_list, list):
-                for t in tools_list:
-                    if isinstance(t, dict) and isinstance(name := t.get("name"), str):
-                        tool_names.add(name)
-
-            # Format: {"results": [...]} for search_tools_or_skills (type="tool" only)
-            results_list = content.get("results", [])
-            if isinstance(results_list, list):
-                for r in results_list:
-                    if isinstance(r, dict) and r.get("type") == "tool":
-                        if isinstance(name := r.get("name"), str):
-                            tool_names.add(name)
+        return result.content if hasattr(result, "content") else result
 
+    def _process_tool_search_result(self, request: ToolCallRequest, result: Any) -> None:
+        """Process tool search results to track discovered tools."""
+        content = self._search_result_content(request, result)
+        if content is not None:
+            self._track_discovered_tools(_get_result_tool_names(content))
+
+    async def _aprocess_tool_search_result(self, request: ToolCallRequest, result: Any) -> None:
+        """Process tool search results to track discovered tools (large JSON is parsed in a thread)."""
+        content = self._search_result_content(request, result)
+        if content is None:
+            return
+        if isinstance(content, str) and len(content) > _THREADED_PARSE_MIN_SIZE:
+            tool_names = await asyncio.to_thread(_parse_tool_names, content)
+        else:
+            tool_names = _get_result_tool_names(content)
+        self._track_discovered_tools(tool_names)
+
+    def _track_discovered_tools(self, tool_names: frozenset[str]) -> None:
+        """Add registered tools from a search result to the discovered tools."""
         # Track discovered tools (no interrupt)
-        for name in tool_names:
-            if name in self.tool_registry and name not in self.discovered_tools:
-                self.discovered_tools.add(name)
-                rich.print(f"[yellow]Discovered: {name}[/yellow]")
+        new_tools = (tool_names & self._registry_names) - self._discovered_tools
+        if not new_tools:
+            return
+        self.discovered_tools = self._discovered_tools | new_tools
+        for name in new_tools:
+            rich.print(f"[yellow]Discovered: {name}[/yellow]")
 
     def _check_tool_enabled(self, request: ToolCallRequest) -> ToolMessage | None:
         """Check if tool is enabled. Returns error ToolMessage if not."""
         tool_name = request.tool.name if request.tool else ""
-        if tool_name in self.ALWAYS_VISIBLE or tool_name in self.discovered_tools:
+        if tool_name in self._allowed:
             return None
         # Tool not enabled - return error
         rich.print(f"[red]Blocked: {tool_name} (not enabled)[/red]")
@@ -160,5 +245,5 @@ class ToolSearchFilterMiddleware(AgentMiddleware[AgentState[Any], Any]):
         if error := self._check_tool_enabled(request):
             return error
         result = await handler(request)
-        self._process_tool_search_result(request, result)
+        await self._aprocess_tool_search_result(request, result)
         return result
@@ -1,15 +1,59 @@
 """Thread selection for resuming conversations."""
 
-import json
+import asyncio
+import logging
+import sqlite3
+from array import array
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import orjson
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
-from prompt_toolkit import PromptSession
-from rich.console import Console
-from rich.table import Table
 
 if TYPE_CHECKING:
-    from langgraph.checkpoint.base import BaseCheckpointSaver
+    from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple
+    from rich.console import Console
+
+logger = logging.getLogger(__name__)
+
+# The thread picker's UI imports (prompt_toolkit, rich tables) are deferred to the
+# functions that use them, so importing this module only to restore a thread stays cheap.
+
+
+# Tools found in tool search results, by message ID (stable across checkpoint reads)
+_search_result_tools: dict[str, tuple[str, ...]] = {}
+_search_result_cache_max_size = 1024
+
+
+def _get_search_result_tools(msg: ToolMessage) -> tuple[str, ...]:
+    """Get the tool names listed in a tool search result, parsing each message only once."""
+    msg_id = msg.id
+    if msg_id is not None:
+        cached = _search_result_tools.get(msg_id)
+        if cached is not None:
+            return cached
+
+    content: Any = msg.content
+    if isinstance(content, str):
+        try:
+            content = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            content = None
+    names: tuple[str, ...] = ()
+    if isinstance(content, dict):
+        names = tuple(
+            t["name"] for t in content.get("tools", []) if isinstance(t, dict) and isinstance(t.get("name"), str)
+        )
+
+    if msg_id is not None:
+        # Simple cache eviction: clear when full
+        if len(_search_result_tools) >= _search_result_cache_max_size:
+            _search_result_tools.clear()
+        _search_result_tools[msg_id] = names
+    return names
 
 
 def _extract_tools_from_messages(messages: list[Any]) -> set[str]:
@@ -21,22 +65,13 @@ def _extract_tools_from_messages(messages: list[Any]) -> set[str]:
     """
     tools: set[str] = set()
     for msg in messages:
-        if type(msg).__name__ == "ToolMessage":
+        if isinstance(msg, ToolMessage):
             if not hasattr(msg, "name") or not msg.name:
                 continue
 
             if msg.name in ("tool_search", "tool_search_regex"):
                 # Extract discovered tools from tool_search result
-                content = msg.content
-                if isinstance(content, str):
-                    try:
-                        content = json.loads(content)
-                    except json.JSONDecodeError:
-                        continue
-                if isinstance(content, dict):
-                    for t in content.get("tools", []):
-                        if isinstance(t, dict) and isinstance(t.get("name"), str):
-                            tools.add(t["name"])
+                tools.update(_get_search_result_tools(msg))
             else:
                 # Tool that was actually called
                 tools.add(msg.name)
@@ -46,7 +81,7 @@ def _extract_tools_from_messages(messages: list[Any]) -> set[str]:
 def _get_first_human_message_preview(messages: list[Any]) -> str:
     """Get preview text from first HumanMessage."""
     for msg in messages:
-        if type(msg).__name__ == "HumanMessage":
+        if isinstance(msg, HumanMessage):
             content = msg.content
             if isinstance(content, str):
                 return content[:50] + ("..." if len(content) > 50 else "")
@@ -87,7 +122,18 @@ async def aget_discovered_tools(thread_id: str, checkpointer: "BaseCheckpointSav
     return _extract_tools_from_messages(messages)
 
 
-def print_recent_messages(messages: list[Any], console: Console, limit: int = 4) -> None:
+def _get_text(content: Any) -> str | None:
+    """Get the text of string or content-block message content (None for other content)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            block.get("text", "") for block in content if isinstance(block, dict) and block.get("type") == "text"
+        )
+    return None
+
+
+def print_recent_messages(messages: list[Any], console: "Console", limit: int = 4) -> None:
     """Print recent conversation messages.
 
     Args:
@@ -95,37 +141,27 @@ def print_recent_messages(messages: list[Any], console: Console, limit: int = 4)
         console: Rich console for output.
         limit: Maximum number of message pairs to show.
     """
-    # Filter to Human and AI messages only (skip tool messages)
-    display_messages: list[tuple[str, str]] = []
-    for msg in messages:
-        msg_type = type(msg).__name__
-        if msg_type == "HumanMessage":
-            content = msg.content
-            if isinstance(content, str):
-                display_messages.append(("user", content))
-        elif msg_type == "AIMessage":
+    # Collect the last N Human and AI messages (skip tool messages), newest first
+    recent: list[tuple[str, str]] = []
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
             content = msg.content
-            # Handle both string and list content
-            if isinstance(content, str):
-                text = content
-            elif isinstance(content, list):
-                # Extract text from content blocks
-                text_parts = [
-                    block.get("text", "")
-                    for block in content
-                    if isinstance(block, dict) and block.get("type") == "text"
-                ]
-                text = " ".join(text_parts)
-            else:
+            if not isinstance(content, str):
+                continue
+            recent.append(("user", content))
+        elif isinstance(msg, AIMessage):
+            text = _get_text(msg.content)
+            if text is None or not text.strip():
                 continue
-            if text.strip():
-                display_messages.append(("assistant", text))
+            recent.append(("assistant", text))
+        else:
+            continue
+        if len(recent) == limit:
+            break
 
-    if not display_messages:
+    if not recent:
         return
-
-    # Show last N messages
-    recent = display_messages[-limit:]
+    recent.reverse()
 
     console.print("[dim]── Recent conversation ──[/dim]")
     for role, content in recent:
@@ -137,18 +173,142 @@ def print_recent_messages(messages: list[Any], console: Console, limit: int = 4)
     console.print()
 
 
+@dataclass(slots=True)
+class ThreadSummaries:
+    """Summaries of saved threads, most recently active first, as parallel columns."""
+
+    thread_ids: list[str] = field(default_factory=list)
+    message_counts: array[int] = field(default_factory=lambda: array("i"))
+    previews: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.thread_ids)
+
+    def append(self, thread_id: str, message_count: int, preview: str) -> None:
+        """Add the summary of a thread."""
+        self.thread_ids.append(thread_id)
+        self.message_counts.append(message_count)
+        self.previews.append(preview)
+
+
+# Threads shown per page of the selection table
+THREAD_PAGE_SIZE = 20
+
+# Summaries of threads as of a checkpoint, kept in their own DB next to the checkpoint DB
+_SUMMARY_TABLE_SQL = (
+    "CREATE TABLE IF NOT EXISTS thread_summaries (thread_id TEXT PRIMARY KEY, checkpoint_id TEXT NOT NULL, "
+    "message_count INTEGER NOT NULL, preview TEXT NOT NULL)"
+)
+
+# Latest root checkpoint of each thread, most recently active first
+_LATEST_CHECKPOINTS_QUERY = (
+    "SELECT thread_id, MAX(checkpoint_id) AS checkpoint_id FROM checkpoints "
+    "WHERE checkpoint_ns = '' GROUP BY thread_id ORDER BY checkpoint_id DESC"
+)
+
+
+def _summary_db_path(db_path: Path) -> Path:
+    """Get the summary DB for a checkpoint DB."""
+    return db_path.with_name("thread_summaries.db")
+
+
+def _read_latest_checkpoints(
+    db_path: Path,
+) -> tuple[list[tuple[str, str]], dict[str, tuple[str, int, str]]]:
+    """Read the latest checkpoint ID of each thread, and the stored summaries by thread ID."""
+    with closing(sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)) as conn:
+        latest: list[tuple[str, str]] = conn.execute(_LATEST_CHECKPOINTS_QUERY).fetchall()
+    with closing(sqlite3.connect(_summary_db_path(db_path))) as conn, conn:
+        conn.execute(_SUMMARY_TABLE_SQL)
+        stored = {row[0]: row[1:] for row in conn.execute("SELECT * FROM thread_summaries")}
+    return latest, stored
+
+
+def _store_summaries(db_path: Path, updates: list[tuple[str, str, int, str]]) -> None:
+    """Store thread summaries as of the given checkpoints."""
+    with closing(sqlite3.connect(_summary_db_path(db_path))) as conn, conn:
+        conn.executemany("INSERT OR REPLACE INTO thread_summaries VALUES (?, ?, ?, ?)", updates)
+
+
+async def _aget_sqlite_thread_summaries(
+    checkpointer: "BaseCheckpointSaver[Any]",
+    db_path: Path,
+) -> ThreadSummaries | None:
+    """Get thread summaries from the DB file of a SQLite checkpointer.
+
+    The checkpoint DB is only read, through a connection of its own, to find
+    the latest checkpoint of each thread. That checkpoint is loaded only if
+    no summary was stored for it yet. New summaries are stored for the next
+    call in a separate DB.
+
+    Returns:
+        Thread summaries, or None if the checkpointer is not a SQLite checkpointer
+        or its DB cannot be read.
+    """
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    if not isinstance(checkpointer, AsyncSqliteSaver):
+        return None
+
+    try:
+        latest, stored = await asyncio.to_thread(_read_latest_checkpoints, db_path)
+    except sqlite3.Error as e:
+        logger.debug("Listing threads from %s failed, falling back to alist: %s", db_path, e)
+        return None
+
+    summaries = ThreadSummaries()
+    updates: list[tuple[str, str, int, str]] = []
+    for thread_id, checkpoint_id in latest:
+        summary = stored.get(thread_id)
+        if summary is not None and summary[0] == checkpoint_id:
+            message_count, preview = summary[1], summary[2]
+        else:
+            config: RunnableConfig = {
+                "configurable": {"thread_id": thread_id, "checkpoint_ns": "", "checkpoint_id": checkpoint_id}
+            }
+            checkpoint_tuple = await checkpointer.aget_tuple(config)
+            if checkpoint_tuple is None:
+                continue
+            message_count, preview = _summarize_checkpoint(checkpoint_tuple)
+            updates.append((thread_id, checkpoint_id, message_count, preview))
+        summaries.append(thread_id, message_count, preview)
+
+    if updates:
+        try:
+            await asyncio.to_thread(_store_summaries, db_path, updates)
+        except sqlite3.Error as e:
+            logger.warning("Failed to store thread summaries: %s", e)
+
+    return summaries
+
+
+def _summarize_checkpoint(checkpoint_tuple: "CheckpointTuple") -> tuple[int, str]:
+    """Get the message count and preview of a thread from its latest checkpoint."""
+    messages = checkpoint_tuple.checkpoint.get("channel_values", {}).get("messages", [])
+    return len(messages), _get_first_human_message_preview(messages)
+
+
 async def aget_thread_summaries(
     checkpointer: "BaseCheckpointSaver[Any]",
-) -> list[dict[str, Any]]:
+    db_path: Path | None = None,
+) -> ThreadSummaries:
     """Get thread summaries with first user message preview.
 
     Args:
         checkpointer: The checkpointer to query.
+        db_path: DB file of an AsyncSqliteSaver checkpointer. If given, threads are
+            listed from it and their summaries are stored, instead of loading
+            every checkpoint.
 
     Returns:
-        List of thread info dicts with thread_id, message_count, and preview.
+        Thread IDs, message counts, and previews, most recently active thread first.
     """
-    results: list[dict[str, Any]] = []
+    if db_path is not None:
+        summaries = await _aget_sqlite_thread_summaries(checkpointer, db_path)
+        if summaries is not None:
+            return summaries
+
+    summaries = ThreadSummaries()
     seen_threads: set[str] = set()
 
     # alist returns checkpoints in descending order by default
@@ -159,74 +319,97 @@ async def aget_thread_summaries(
             continue
 
         seen_threads.add(thread_id)
-        messages = checkpoint_tuple.checkpoint.get("channel_values", {}).get("messages", [])
+        summaries.append(thread_id, *_summarize_checkpoint(checkpoint_tuple))
 
-        results.append(
-            {
-                "thread_id": thread_id,
-                "message_count": len(messages),
-                "preview": _get_first_human_message_preview(messages),
-            }
+    return summaries
+
+
+def _print_thread_page(threads: ThreadSummaries, page: int, console: "Console") -> None:
+    """Print one page of the thread table (rows are numbered across pages)."""
+    from rich.table import Table
+
+    first = page * THREAD_PAGE_SIZE
+    page_count = (len(threads) + THREAD_PAGE_SIZE - 1) // THREAD_PAGE_SIZE
+    title = "Available Threads"
+    if page_count > 1:
+        title += f" (page {page + 1}/{page_count})"
+
+    table = Table(title=title, show_header=True)
+    table.add_column("#", style="cyan", width=3)
+    table.add_column("Thread ID", style="green")
+    table.add_column("Messages", justify="right")
+    table.add_column("Preview", style="dim")
+
+    for i in range(first, min(first + THREAD_PAGE_SIZE, len(threads))):
+        table.add_row(
+            str(i + 1),
+            threads.thread_ids[i][:8] + "...",
+            str(threads.message_counts[i]),
+            threads.previews[i] or "(empty)",
         )
 
-    return results
+    console.print(table)
+    console.print()
 
 
 async def aselect_thread_interactive(
     checkpointer: "BaseCheckpointSaver[Any]",
-    console: Console | None = None,
+    console: "Console | None" = None,
+    db_path: Path | None = None,
 ) -> str | None:
     """Interactive thread selection UI.
 
     Args:
         checkpointer: The checkpointer to query for threads.
         console: Rich console for output. Created if not provided.
+        db_path: DB file of the checkpointer, if it is an AsyncSqliteSaver
+            (see aget_thread_summaries).
 
     Returns:
         Selected thread_id, or None for new session.
     """
+    from prompt_toolkit import PromptSession
+
     if console is None:
+        from rich.console import Console
+
         console = Console()
 
-    threads = await aget_thread_summaries(checkpointer)
+    threads = await aget_thread_summaries(checkpointer, db_path)
 
     if not threads:
         console.print("[dim]No saved threads found. Starting new session.[/dim]")
         return None
 
-    # Display thread table
-    table = Table(title="Available Threads", show_header=True)
-    table.add_column("#", style="cyan", width=3)
-    table.add_column("Thread ID", style="green")
-    table.add_column("Messages", justify="right")
-    table.add_column("Preview", style="dim")
-
-    for i, thread in enumerate(threads, 1):
-        table.add_row(
-            str(i),
-            thread["thread_id"][:8] + "...",
-            str(thread["message_count"]),
-            thread["preview"] or "(empty)",
-        )
+    page_count = (len(threads) + THREAD_PAGE_SIZE - 1) // THREAD_PAGE_SIZE
+    page = 0
+    _print_thread_page(threads, page, console)
 
-    console.print(table)
-    console.print()
+    if page_count > 1:
+        prompt = f"Select thread (1-{len(threads)}), 'p'/'P' for next/previous page, or 'n' for new: "
+    else:
+        prompt = f"Select thread (1-{len(threads)}) or 'n' for new: "
 
     # Prompt for selection
     session: PromptSession[str] = PromptSession()
     while True:
         try:
-            response = await session.prompt_async(f"Select thread (1-{len(threads)}) or 'n' for new: ")
-            response = response.strip().lower()
+            response = (await session.prompt_async(prompt)).strip()
+
+            # Page navigation (case-sensitive: p = next, P = previous)
+            if response in ("p", "P") and page_count > 1:
+                page = (page + (1 if response == "p" else -1)) % page_count
+                _print_thread_page(threads, page, console)
+                continue
 
+            response = response.lower()
             if response == "n":
                 return None
 
             try:
                 idx = int(response)
                 if 1 <= idx <= len(threads):
-                    selected = threads[idx - 1]
-                    thread_id: str = selected["thread_id"]
+                    thread_id = threads.thread_ids[idx - 1]
                     console.print(f"[green]Resuming thread {thread_id[:8]}...[/green]")
                     return thread_id
                 else:
@@ -3,6 +3,7 @@
 from .builtin import register_builtin_tools
 from .mcp import discover_mcp_servers, load_mcp_tools
 from .registry import TOOL_REGISTRY, get_all_tools, get_tool, register_tool
+from .result_cache import ToolResultCache, create_cache_tools, get_tool_result_cache
 from .sandbox import create_execute_code_tool
 from .search_tools_or_skills import SearchToolsOrSkillsTool
 from .skills import get_skill, get_skill_index, search_skills
@@ -11,6 +12,8 @@ from .tool_search import enable_tool, get_tool_index, tool_search, tool_search_r
 __all__ = [
     "TOOL_REGISTRY",
     "SearchToolsOrSkillsTool",
+    "ToolResultCache",
+    "create_cache_tools",
     "create_execute_code_tool",
     "discover_mcp_servers",
     "enable_tool",
@@ -19,6 +22,7 @@ __all__ = [
     "get_skill_index",
     "get_tool",
     "get_tool_index",
+    "get_tool_result_cache",
     "load_mcp_tools",
     "register_builtin_tools",
     "register_tool",
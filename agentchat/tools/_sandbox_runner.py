@@ -0,0 +1,64 @@
+"""Runner for sandboxed code (executed by execute_code inside sandbox-runtime).
+
+The first stdin line is {"code": "..."} with the async Python code to run as
+the body of main(). After that, stdin carries JSON-RPC 2.0 responses to
+tool_call() requests written to stdout. Only the standard library is used, as
+the sandbox Python may have nothing else installed.
+"""
+
+import asyncio
+import io
+import json
+import sys
+from typing import Any
+
+_request_id = 0
+
+
+async def tool_call(name: str, **kwargs: Any) -> Any:
+    """Call a tool on the host via JSON-RPC 2.0."""
+    global _request_id
+    _request_id += 1
+    request = {
+        "jsonrpc": "2.0",
+        "method": name,
+        "params": kwargs,
+        "id": _request_id,
+    }
+    sys.stdout.write(json.dumps(request) + "\n")
+    sys.stdout.flush()
+    response = json.loads(sys.stdin.readline().strip())
+    if "error" in response:
+        raise Exception(f"Tool error: {response['error']['message']}")
+    return response["result"]
+
+
+_original_print = print
+
+
+def print(*args: Any, **kwargs: Any) -> None:
+    """Print via JSON-RPC 2.0 notification."""
+    buf = io.StringIO()
+    kwargs["file"] = buf
+    _original_print(*args, **kwargs)
+    text = buf.getvalue()
+    notification = {
+        "jsonrpc": "2.0",
+        "method": "print",
+        "params": {"text": text},
+    }
+    sys.stdout.write(json.dumps(notification) + "\n")
+    sys.stdout.flush()
+
+
+def _run() -> None:
+    """Read the code from stdin and run it as the body of async main()."""
+    code = json.loads(sys.stdin.readline())["code"]
+    indented_code = "\n".join("    " + line for line in code.split("\n"))
+    # Defined in this module's namespace, so the code sees tool_call and print above
+    exec(compile(f"async def main():\n{indented_code}\n", "<sandbox>", "exec"), globals())
+    asyncio.run(globals()["main"]())
+
+
+if __name__ == "__main__":
+    _run()
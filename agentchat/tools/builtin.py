@@ -1,11 +1,33 @@
 """Built-in tools for the agent chat application."""
 
+import threading
+from types import MappingProxyType
 from typing import Any
 
 from langchain_core.tools import tool
 
 from .registry import register_tool
 
+# Sample data served by query_sales / get_weather (read-only)
+_SALES_DATA: MappingProxyType[str, dict[str, Any]] = MappingProxyType(
+    {
+        "west": {"revenue": 150000, "units": 1200, "top_product": "Widget A"},
+        "east": {"revenue": 220000, "units": 1800, "top_product": "Widget B"},
+        "central": {"revenue": 180000, "units": 1500, "top_product": "Widget A"},
+        "north": {"revenue": 95000, "units": 800, "top_product": "Widget C"},
+        "south": {"revenue": 130000, "units": 1100, "top_product": "Widget B"},
+    }
+)
+_WEATHER_DATA: MappingProxyType[str, dict[str, Any]] = MappingProxyType(
+    {
+        "tokyo": {"temp": 22, "condition": "Sunny", "humidity": 45},
+        "new york": {"temp": 18, "condition": "Cloudy", "humidity": 60},
+        "london": {"temp": 15, "condition": "Rainy", "humidity": 80},
+        "paris": {"temp": 20, "condition": "Partly Cloudy", "humidity": 55},
+        "sydney": {"temp": 25, "condition": "Sunny", "humidity": 40},
+    }
+)
+
 
 @tool
 def query_sales(region: str) -> dict[str, Any]:
@@ -17,16 +39,9 @@ def query_sales(region: str) -> dict[str, Any]:
     Returns: {"region": str, "revenue": int, "units": int, "top_product": str}
     Error: {"error": str} if region not found.
     """
-    data: dict[str, dict[str, Any]] = {
-        "west": {"revenue": 150000, "units": 1200, "top_product": "Widget A"},
-        "east": {"revenue": 220000, "units": 1800, "top_product": "Widget B"},
-        "central": {"revenue": 180000, "units": 1500, "top_product": "Widget A"},
-        "north": {"revenue": 95000, "units": 800, "top_product": "Widget C"},
-        "south": {"revenue": 130000, "units": 1100, "top_product": "Widget B"},
-    }
-    region_lower = region.lower()
-    if region_lower in data:
-        return {"region": region, **data[region_lower]}
+    row = _SALES_DATA.get(region.lower())
+    if row is not None:
+        return {"region": region, **row}
     return {"error": f"Unknown region: {region}"}
 
 
@@ -40,16 +55,9 @@ def get_weather(city: str) -> dict[str, Any]:
     Returns: {"city": str, "temp": int, "condition": str, "humidity": int}
     Error: {"error": str} if city not found.
     """
-    data: dict[str, dict[str, Any]] = {
-        "tokyo": {"temp": 22, "condition": "Sunny", "humidity": 45},
-        "new york": {"temp": 18, "condition": "Cloudy", "humidity": 60},
-        "london": {"temp": 15, "condition": "Rainy", "humidity": 80},
-        "paris": {"temp": 20, "condition": "Partly Cloudy", "humidity": 55},
-        "sydney": {"temp": 25, "condition": "Sunny", "humidity": 40},
-    }
-    city_lower = city.lower()
-    if city_lower in data:
-        return {"city": city, **data[city_lower]}
+    row = _WEATHER_DATA.get(city.lower())
+    if row is not None:
+        return {"city": city, **row}
     return {"error": f"Unknown city: {city}"}
 
 
@@ -130,14 +138,31 @@ def read_emails(folder: str = "inbox") -> dict[str, Any]:
     }
 
 
+# Read-only tools whose results can be memoized by execute_code
+for _t in (query_sales, get_weather):
+    _t.metadata = {**(_t.metadata or {}), "cacheable": True}
+
+
+# Registration is idempotent so repeated factory initialization doesn't redo it
+_registered = False
+_register_lock = threading.Lock()
+
+
 def register_builtin_tools() -> None:
-    """Register all built-in tools in the global registry."""
-    for t in [
-        query_sales,
-        get_weather,
-        send_email,
-        create_calendar_event,
-        list_calendar_events,
-        read_emails,
-    ]:
-        register_tool(t)
+    """Register all built-in tools in the global registry (once per process)."""
+    global _registered
+    if _registered:
+        return
+    with _register_lock:
+        if _registered:
+            return
+        for t in [
+            query_sales,
+            get_weather,
+            send_email,
+            create_calendar_event,
+            list_calendar_events,
+            read_emails,
+        ]:
+            register_tool(t)
+        _registered = True
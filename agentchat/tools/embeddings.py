@@ -1,7 +1,13 @@
 """Shared embeddings module with query caching."""
 
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
 from functools import lru_cache
-from typing import Any, Protocol
+from pathlib import Path
+from typing import IO, Any, Protocol
 
 import numpy as np
 from numpy.typing import NDArray
@@ -22,6 +28,20 @@ class SearchableIndex(Protocol):
         """
         ...
 
+    @property
+    def fingerprint(self) -> str | None:
+        """Fingerprint of the indexed documents (building the index if needed), or None if empty."""
+        ...
+
+
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+
+# Persisted search indexes (project root tmp/, reused across processes)
+INDEX_CACHE_DIR = Path(__file__).parent.parent.parent / "tmp" / "index_cache"
+
+# Cached versions (document sets) kept per index, e.g. for the registries of both chat modes
+CACHED_VERSIONS = 4
+
 
 @lru_cache(maxsize=1)
 def get_embeddings() -> Any:
@@ -32,15 +52,14 @@ def get_embeddings() -> Any:
     """
     from lancedb.embeddings import get_registry
 
-    return (
-        get_registry()
-        .get("sentence-transformers")
-        .create(name="paraphrase-multilingual-MiniLM-L12-v2")
-    )
+    return get_registry().get("sentence-transformers").create(name=EMBEDDING_MODEL)
 
 
-# Simple cache for query embeddings (avoids re-encoding same query)
-_query_cache: dict[str, NDArray[np.float32]] = {}
+# Number of recent (query, top_k) search results kept per index
+SEARCH_CACHE_SIZE = 128
+
+# LRU cache for query embeddings (avoids re-encoding same query)
+_query_cache: OrderedDict[str, NDArray[np.float32]] = OrderedDict()
 _cache_max_size = 10
 
 
@@ -53,21 +72,177 @@ def encode_query(query: str) -> NDArray[np.float32]:
     Returns:
         The embedding vector as numpy array.
     """
-    if query in _query_cache:
-        return _query_cache[query]
+    return encode_queries([query])[0]
+
+
+def encode_queries(queries: Sequence[str]) -> list[NDArray[np.float32]]:
+    """Encode query strings to vectors, with caching.
 
-    embeddings = get_embeddings()
-    raw = embeddings.compute_query_embeddings(query)[0]
-    vector: NDArray[np.float32] = np.array(raw, dtype=np.float32)
+    Queries that are not cached are encoded in a single batch.
 
-    # Simple cache eviction: clear when full
-    if len(_query_cache) >= _cache_max_size:
-        _query_cache.clear()
+    Args:
+        queries: The query strings to encode.
 
-    _query_cache[query] = vector
-    return vector
+    Returns:
+        The embedding vectors as numpy arrays, in query order.
+    """
+    vectors: dict[str, NDArray[np.float32]] = {}
+    for query in queries:
+        cached = _query_cache.get(query)
+        if cached is not None:
+            _query_cache.move_to_end(query)
+            vectors[query] = cached
+
+    uncached = [query for query in dict.fromkeys(queries) if query not in vectors]
+    if uncached:
+        raw = get_embeddings().compute_query_embeddings(uncached)
+        for query, embedding in zip(uncached, raw, strict=True):
+            vector: NDArray[np.float32] = np.asarray(embedding, dtype=np.float32)
+            vectors[query] = vector
+            _query_cache[query] = vector
+            if len(_query_cache) > _cache_max_size:
+                _query_cache.popitem(last=False)
+
+    return [vectors[query] for query in queries]
 
 
 def get_embedding_dims() -> int:
     """Get the dimensionality of the embedding model."""
     return int(get_embeddings().ndims())
+
+
+def index_fingerprint(docs: Iterable[Sequence[str]]) -> str:
+    """Compute a stable fingerprint of indexed documents and the embedding model.
+
+    Args:
+        docs: Text fields of each indexed document (order-independent).
+
+    Returns:
+        Hex digest that changes whenever any document or the model changes.
+    """
+    digest = hashlib.sha256(EMBEDDING_MODEL.encode())
+    for doc in sorted(tuple(d) for d in docs):
+        for field in doc:
+            digest.update(field.encode())
+            digest.update(b"\0")
+        digest.update(b"\1")
+    return digest.hexdigest()
+
+
+def cached_table_name(name: str, fingerprint: str) -> str:
+    """Get the LanceDB table name for a document set.
+
+    Each fingerprint has its own table (and vectors file, see save_cached_vectors),
+    so indexes over different registries (e.g. of direct and programmatic mode)
+    do not overwrite each other.
+    """
+    return f"{name}-{fingerprint}"
+
+
+def open_cached_table(db: Any, name: str, fingerprint: str) -> Any:
+    """Open a persisted LanceDB table if it was built from the same documents.
+
+    Args:
+        db: LanceDB connection to INDEX_CACHE_DIR.
+        name: Table name.
+        fingerprint: Fingerprint of the documents to be indexed.
+
+    Returns:
+        The existing table, or None if missing or not completely built.
+    """
+    table_name = cached_table_name(name, fingerprint)
+    marker_path = INDEX_CACHE_DIR / f"{table_name}.fingerprint"
+    if not marker_path.exists() or table_name not in db.table_names():
+        return None
+    _touch(marker_path)
+    return db.open_table(table_name)
+
+
+def _write_atomic(path: Path, write: Callable[[IO[bytes]], object]) -> None:
+    """Write a file via a temporary file in the same directory, so readers never see a partial file."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", delete=False) as f:
+        tmp_path = Path(f.name)
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            tmp_path.unlink(missing_ok=True)
+            raise
+    os.replace(tmp_path, path)
+
+
+def _touch(path: Path) -> None:
+    """Mark a cache file as recently used (see _prune_cached)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _prune_cached(name: str, suffix: str, db: Any = None) -> None:
+    """Delete the least recently used cached versions of an index beyond CACHED_VERSIONS.
+
+    Versions are `{name}-{fingerprint}{suffix}` files, whose mtime is their last use.
+    With a LanceDB connection, the tables of deleted versions are dropped too.
+    """
+    versions: list[tuple[float, Path]] = []
+    for path in INDEX_CACHE_DIR.glob(f"{name}-*{suffix}"):
+        try:
+            versions.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    versions.sort(reverse=True)
+    for _, path in versions[CACHED_VERSIONS:]:
+        path.unlink(missing_ok=True)
+        if db is not None:
+            table_name = path.name.removesuffix(suffix)
+            if table_name in db.table_names():
+                db.drop_table(table_name)
+
+
+def save_table_fingerprint(db: Any, name: str, fingerprint: str) -> None:
+    """Mark a freshly built table as complete for later reuse, and drop stale tables."""
+    table_name = cached_table_name(name, fingerprint)
+    _write_atomic(INDEX_CACHE_DIR / f"{table_name}.fingerprint", lambda f: f.write(fingerprint.encode()))
+    _prune_cached(name, ".fingerprint", db)
+
+
+def compute_embeddings(texts: list[str]) -> NDArray[np.float32]:
+    """Embed documents with the shared embedding model.
+
+    Args:
+        texts: Document texts.
+
+    Returns:
+        Matrix of shape (len(texts), dims).
+    """
+    return np.array(get_embeddings().compute_source_embeddings(texts), dtype=np.float32)
+
+
+def _vectors_path(name: str, fingerprint: str) -> Path:
+    """Get the vectors file for a document set (one per fingerprint, like tables)."""
+    return INDEX_CACHE_DIR / f"{name}-{fingerprint}.npy"
+
+
+def load_cached_vectors(name: str, fingerprint: str) -> NDArray[np.float32] | None:
+    """Load persisted document embeddings if they were computed from the same documents.
+
+    Args:
+        name: Name the vectors were saved under.
+        fingerprint: Fingerprint of the documents to be indexed.
+
+    Returns:
+        The embedding matrix, or None if missing.
+    """
+    vectors_path = _vectors_path(name, fingerprint)
+    if not vectors_path.exists():
+        return None
+    vectors: NDArray[np.float32] = np.load(vectors_path)
+    _touch(vectors_path)
+    return vectors
+
+
+def save_cached_vectors(name: str, fingerprint: str, vectors: NDArray[np.float32]) -> None:
+    """Persist document embeddings for later reuse."""
+    _write_atomic(_vectors_path(name, fingerprint), lambda f: np.save(f, vectors))
+    _prune_cached(name, ".npy")
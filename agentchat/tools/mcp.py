@@ -1,5 +1,6 @@
 """MCP (Model Context Protocol) tool loading from mcp_servers/ directory."""
 
+import asyncio
 from contextlib import AsyncExitStack
 from pathlib import Path
 
@@ -11,6 +12,9 @@ from langchain_mcp_adapters.tools import load_mcp_tools as _load_mcp_tools
 # Default path for MCP servers
 MCP_SERVERS_DIR = Path(__file__).parent.parent.parent / "mcp_servers"
 
+# Discovery results per directory: path -> (directory mtime_ns, servers)
+_discovery_cache: dict[Path, tuple[int, dict[str, Path]]] = {}
+
 
 def discover_mcp_servers(servers_dir: Path | None = None) -> dict[str, Path]:
     """Discover MCP server files in the directory.
@@ -25,16 +29,47 @@ def discover_mcp_servers(servers_dir: Path | None = None) -> dict[str, Path]:
     if servers_dir is None:
         servers_dir = MCP_SERVERS_DIR
 
-    if not servers_dir.exists():
+    try:
+        mtime = servers_dir.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
 
+    # Directory mtime changes when server files are added, removed or renamed
+    cached = _discovery_cache.get(servers_dir)
+    if cached is not None and cached[0] == mtime:
+        return dict(cached[1])
+
     servers: dict[str, Path] = {}
     for path in servers_dir.glob("*_server.py"):
         # Extract name: math_server.py -> math
         name = path.stem.removesuffix("_server")
         servers[name] = path
 
-    return servers
+    _discovery_cache[servers_dir] = (mtime, servers)
+    return dict(servers)
+
+
+async def _hold_session(
+    client: MultiServerMCPClient,
+    name: str,
+    ready: "asyncio.Future[list[BaseTool]]",
+    stop: asyncio.Event,
+) -> None:
+    """Open one MCP session, report its tools via ready, and keep it open until stop is set.
+
+    The session is entered and exited in this task, as its anyio cancel scopes require.
+    """
+    try:
+        async with client.session(name) as session:
+            ready.set_result(await _load_mcp_tools(session))
+            await stop.wait()
+    except asyncio.CancelledError:
+        ready.cancel()
+        raise
+    except BaseException as e:
+        if not ready.done():
+            ready.set_exception(e)
+        raise
 
 
 async def load_mcp_tools(
@@ -48,6 +83,9 @@ async def load_mcp_tools(
     Returns:
         Tuple of (exit_stack, tools). Caller must keep exit_stack alive
         for the duration of tool usage.
+
+    Server processes are started concurrently; each session lives in its own
+    task, so the exit stack can be closed from any task.
     """
     servers = discover_mcp_servers(servers_dir)
     if not servers:
@@ -63,12 +101,32 @@ async def load_mcp_tools(
         )
 
     client = MultiServerMCPClient(config)
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    readies: list[asyncio.Future[list[BaseTool]]] = [loop.create_future() for _ in servers]
+    tasks = [
+        asyncio.create_task(_hold_session(client, name, ready, stop))
+        for name, ready in zip(servers, readies, strict=True)
+    ]
+
+    async def close_sessions() -> None:
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     stack = AsyncExitStack()
-    tools: list[BaseTool] = []
+    stack.push_async_callback(close_sessions)
 
-    for name in servers:
-        session = await stack.enter_async_context(client.session(name))
-        server_tools = await _load_mcp_tools(session)
-        tools.extend(server_tools)
+    try:
+        results = await asyncio.gather(*readies, return_exceptions=True)
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    tools: list[BaseTool] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            await stack.aclose()
+            raise result
+        tools.extend(result)
 
     return stack, tools
@@ -0,0 +1,103 @@
+"""In-memory hybrid search for small document sets."""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Registries up to this size are searched in memory instead of via LanceDB
+MEMORY_INDEX_MAX_DOCS = 1000
+
+# Same tokenization as LanceDB's "simple" FTS tokenizer: lowercase word characters
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# BM25 parameters and RRF constant (RRFReranker default)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_RRF_K = 60
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class MemoryIndex:
+    """Hybrid (BM25 + vector) index held entirely in memory.
+
+    Mirrors the LanceDB hybrid query used by the tool and skill indexes
+    (top_k from each ranking, fused with RRF), but for tens to hundreds of
+    documents a single matrix-vector product and a dict-based BM25 are much
+    cheaper than a LanceDB query.
+    """
+
+    def __init__(self, docs: list[dict[str, Any]], vectors: NDArray[np.float32], text_field: str = "text") -> None:
+        """Build the index.
+
+        Args:
+            docs: Documents to return from search (must contain text_field).
+            vectors: Embeddings of the documents, one row per document.
+            text_field: Document field used for BM25.
+        """
+        self.docs = docs
+
+        # Normalize rows so the dot product is cosine similarity
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.vectors: NDArray[np.float32] = (vectors / np.maximum(norms, 1e-12)).astype(np.float32)
+
+        # Inverted index: token -> [(doc index, term frequency)]
+        self._postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._doc_lengths: list[int] = []
+        for i, doc in enumerate(docs):
+            tokens = _tokenize(doc[text_field])
+            self._doc_lengths.append(len(tokens))
+            for token, tf in Counter(tokens).items():
+                self._postings[token].append((i, tf))
+        self._avg_doc_length = sum(self._doc_lengths) / len(docs) if docs else 0.0
+
+    def _vector_ranking(self, vector: NDArray[np.float32], top_k: int) -> list[int]:
+        """Get indexes of the top_k documents by cosine similarity."""
+        scores = self.vectors @ (vector / max(float(np.linalg.norm(vector)), 1e-12))
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        return [int(i) for i in candidates[np.argsort(-scores[candidates])]]
+
+    def _bm25_ranking(self, query: str, top_k: int) -> list[int]:
+        """Get indexes of the top_k documents by BM25 score (matching documents only)."""
+        n = len(self.docs)
+        scores: dict[int, float] = defaultdict(float)
+        for token in set(_tokenize(query)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, tf in postings:
+                norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * self._doc_lengths[i] / self._avg_doc_length)
+                scores[i] += idf * tf * (_BM25_K1 + 1) / (tf + norm)
+        return sorted(scores, key=scores.__getitem__, reverse=True)[:top_k]
+
+    def search(self, query: str, vector: NDArray[np.float32], top_k: int = 5) -> list[dict[str, Any]]:
+        """Search with BM25 and vector rankings fused by Reciprocal Rank Fusion.
+
+        Args:
+            query: Query text for BM25.
+            vector: Query embedding.
+            top_k: Number of results to return.
+
+        Returns:
+            Matching documents with "_relevance_score", best first.
+        """
+        if not self.docs:
+            return []
+
+        rrf_scores: dict[int, float] = defaultdict(float)
+        for ranking in (self._vector_ranking(vector, top_k), self._bm25_ranking(query, top_k)):
+            for rank, i in enumerate(ranking, 1):
+                rrf_scores[i] += 1 / (rank + _RRF_K)
+
+        best = sorted(rrf_scores, key=rrf_scores.__getitem__, reverse=True)[:top_k]
+        return [{**self.docs[i], "_relevance_score": rrf_scores[i]} for i in best]
@@ -0,0 +1,150 @@
+"""On-disk memoization of tool results for sandboxed tool calls."""
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from langchain_core.tools import BaseTool, tool
+
+# Default path for the tool result cache
+TOOL_CACHE_DB_PATH = Path(__file__).parent.parent.parent / "tmp" / "tool_cache.db"
+
+# Sentinel for cache misses (None is a valid tool result)
+MISS = object()
+
+
+def is_cacheable(tool: BaseTool) -> bool:
+    """Check whether a tool opted in to result caching via metadata["cacheable"]."""
+    return bool(tool.metadata and tool.metadata.get("cacheable"))
+
+
+class ToolResultCache:
+    """Bounded SQLite cache of tool results keyed by tool name and arguments.
+
+    Entries expire after `ttl` seconds; when more than `max_entries` are stored,
+    the oldest entries are evicted.
+    """
+
+    def __init__(self, db_path: Path = TOOL_CACHE_DB_PATH, *, ttl: float = 300.0, max_entries: int = 1024) -> None:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache "
+                "(name TEXT NOT NULL, args TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (name, args))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _args_key(args: dict[str, Any]) -> str:
+        """Canonicalize tool arguments so equivalent calls share an entry."""
+        return json.dumps(args, sort_keys=True, separators=(",", ":"))
+
+    def get(self, name: str, args: dict[str, Any]) -> Any:
+        """Get a cached result.
+
+        Args:
+            name: Tool name.
+            args: Tool arguments.
+
+        Returns:
+            The cached result, or MISS if absent or expired.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT result FROM tool_cache WHERE name = ? AND args = ? AND created_at > ?",
+                (name, self._args_key(args), time.time() - self.ttl),
+            ).fetchone()
+        return MISS if row is None else json.loads(row[0])
+
+    def set(self, name: str, args: dict[str, Any], result: Any) -> None:
+        """Store a JSON-serializable tool result, evicting the oldest entries if over capacity."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO tool_cache VALUES (?, ?, ?, ?)",
+                (name, self._args_key(args), json.dumps(result), time.time()),
+            )
+            conn.execute(
+                "DELETE FROM tool_cache WHERE rowid IN "
+                "(SELECT rowid FROM tool_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, name: str, args: dict[str, Any] | None = None) -> int:
+        """Remove cached results for a tool.
+
+        Args:
+            name: Tool name.
+            args: Tool arguments. If None, all results for the tool are removed.
+
+        Returns:
+            Number of removed entries.
+        """
+        with closing(self._connect()) as conn, conn:
+            if args is None:
+                cursor = conn.execute("DELETE FROM tool_cache WHERE name = ?", (name,))
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM tool_cache WHERE name = ? AND args = ?", (name, self._args_key(args))
+                )
+            return cursor.rowcount
+
+
+def create_cache_tools(cache: ToolResultCache) -> list[BaseTool]:
+    """Create tools exposing the result cache to sandboxed code.
+
+    Args:
+        cache: The tool result cache.
+
+    Returns:
+        [cache_get, cache_invalidate] tools.
+    """
+
+    @tool
+    def cache_get(tool_name: str, arguments: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Get a cached result of a previous tool call without re-running the tool.
+
+        Args:
+            tool_name: Name of the cached tool.
+            arguments: Tool arguments of the cached call (default: no arguments).
+
+        Returns: {"hit": true, "result": ...} if cached, {"hit": false} otherwise.
+        """
+        result = cache.get(tool_name, arguments or {})
+        if result is MISS:
+            return {"hit": False}
+        return {"hit": True, "result": result}
+
+    @tool
+    def cache_invalidate(tool_name: str, arguments: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Drop cached results of a tool so the next call fetches fresh data.
+
+        Args:
+            tool_name: Name of the cached tool.
+            arguments: Tool arguments to invalidate. If omitted, all cached results of the tool are dropped.
+
+        Returns: {"invalidated": int}
+        """
+        return {"invalidated": cache.invalidate(tool_name, arguments)}
+
+    return [cache_get, cache_invalidate]
+
+
+# Lazy-initialized shared cache
+_tool_result_cache: ToolResultCache | None = None
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Get or create the global tool result cache."""
+    global _tool_result_cache
+    if _tool_result_cache is None:
+        _tool_result_cache = ToolResultCache()
+    return _tool_result_cache
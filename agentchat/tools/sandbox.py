@@ -1,14 +1,18 @@
 """Sandboxed code execution tool using sandbox-runtime (srt)."""
 
 import asyncio
-import json
 import shutil
 import subprocess
-import tempfile
 from pathlib import Path
 
+import orjson
 from langchain_core.tools import BaseTool, tool
 
+from .result_cache import MISS, ToolResultCache, is_cacheable
+
+# JSON-RPC runner executed in the sandbox (reads the code to run from stdin)
+_RUNNER_PATH = Path(__file__).with_name("_sandbox_runner.py")
+
 # Lazy-initialized srt command
 _srt_cmd: list[str] | None = None
 _srt_checked: bool = False
@@ -35,6 +39,7 @@ def create_execute_code_tool(
     registry: dict[str, BaseTool],
     *,
     srt_settings: str | Path | None = None,
+    result_cache: ToolResultCache | None = None,
 ) -> BaseTool:
     """Create a sandboxed code execution tool.
 
@@ -42,6 +47,8 @@ def create_execute_code_tool(
         registry: Tool registry for resolving tool calls.
         srt_settings: Optional path to srt settings file for network/filesystem
             permissions. See https://github.com/anthropic-experimental/sandbox-runtime
+        result_cache: Optional cache for results of tools marked cacheable
+            (metadata["cacheable"]). Other tools always run.
 
     Returns:
         A tool that executes Python code in a sandbox with tool_call support.
@@ -84,66 +91,12 @@ def create_execute_code_tool(
         Returns:
             The printed output from the code, or error message if execution fails.
         """
-        # Indent user code for async main()
-        indented_code = "\n".join("    " + line for line in code.split("\n"))
-
-        # JSON-RPC 2.0 wrapper
-        wrapper = f'''
-import asyncio
-import json
-import sys
-
-_request_id = 0
-
-async def tool_call(name, **kwargs):
-    """Call a tool on the host via JSON-RPC 2.0."""
-    global _request_id
-    _request_id += 1
-    request = {{
-        "jsonrpc": "2.0",
-        "method": name,
-        "params": kwargs,
-        "id": _request_id
-    }}
-    sys.stdout.write(json.dumps(request) + "\\n")
-    sys.stdout.flush()
-    response = json.loads(sys.stdin.readline().strip())
-    if "error" in response:
-        raise Exception(f"Tool error: {{response['error']['message']}}")
-    return response["result"]
-
-_original_print = print
-def print(*args, **kwargs):
-    """Print via JSON-RPC 2.0 notification."""
-    import io
-    buf = io.StringIO()
-    kwargs["file"] = buf
-    _original_print(*args, **kwargs)
-    text = buf.getvalue()
-    notification = {{
-        "jsonrpc": "2.0",
-        "method": "print",
-        "params": {{"text": text}}
-    }}
-    sys.stdout.write(json.dumps(notification) + "\\n")
-    sys.stdout.flush()
-
-async def main():
-{indented_code}
-
-asyncio.run(main())
-'''
-
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write(wrapper)
-            script_path = f.name
-
         try:
             proc = await asyncio.create_subprocess_exec(
                 *srt_cmd,
                 "python",
                 "-u",
-                script_path,
+                str(_RUNNER_PATH),
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
@@ -156,6 +109,10 @@ asyncio.run(main())
             proc_stdout = proc.stdout
             proc_stderr = proc.stderr
 
+            # The runner reads the code to execute from its first stdin line
+            proc_stdin.write(orjson.dumps({"code": code}, option=orjson.OPT_APPEND_NEWLINE))
+            await proc_stdin.drain()
+
             output_lines: list[str] = []
 
             timed_out = False
@@ -169,14 +126,14 @@ asyncio.run(main())
                 if not line_bytes:
                     break
 
-                line = line_bytes.decode().strip()
+                line = line_bytes.strip()
                 if not line:
                     continue
 
                 # Parse JSON-RPC message
                 try:
-                    msg = json.loads(line)
-                except json.JSONDecodeError:
+                    msg = orjson.loads(line)
+                except orjson.JSONDecodeError:
                     continue
 
                 # Check if notification (no id) or request (has id)
@@ -192,20 +149,30 @@ asyncio.run(main())
 
                     if tool_name in registry:
                         tool_obj = registry[tool_name]
-                        # Use ainvoke for async tools (like MCP tools)
-                        if hasattr(tool_obj, "coroutine") and tool_obj.coroutine is not None:
-                            raw_result = await tool_obj.ainvoke(tool_kwargs)
-                        else:
-                            raw_result = tool_obj.invoke(tool_kwargs)
-
-                        # MCP tools may return JSON strings - parse if needed
-                        if isinstance(raw_result, str):
-                            try:
-                                call_result = json.loads(raw_result)
-                            except json.JSONDecodeError:
+                        cache = result_cache if result_cache is not None and is_cacheable(tool_obj) else None
+                        # The cache is a SQLite file; keep its reads and writes off the event loop
+                        call_result = (
+                            await asyncio.to_thread(cache.get, tool_name, tool_kwargs) if cache is not None else MISS
+                        )
+
+                        if call_result is MISS:
+                            # Use ainvoke for async tools (like MCP tools)
+                            if hasattr(tool_obj, "coroutine") and tool_obj.coroutine is not None:
+                                raw_result = await tool_obj.ainvoke(tool_kwargs)
+                            else:
+                                raw_result = tool_obj.invoke(tool_kwargs)
+
+                            # MCP tools may return JSON strings - parse if needed
+                            if isinstance(raw_result, str):
+                                try:
+                                    call_result = orjson.loads(raw_result)
+                                except orjson.JSONDecodeError:
+                                    call_result = raw_result
+                            else:
                                 call_result = raw_result
-                        else:
-                            call_result = raw_result
+
+                            if cache is not None:
+                                await asyncio.to_thread(cache.set, tool_name, tool_kwargs, call_result)
 
                         response = {
                             "jsonrpc": "2.0",
@@ -219,7 +186,7 @@ asyncio.run(main())
                             "id": request_id,
                         }
 
-                    proc_stdin.write((json.dumps(response) + "\n").encode())
+                    proc_stdin.write(orjson.dumps(response, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
                     await proc_stdin.drain()
 
             # Kill process if timed out
@@ -246,7 +213,5 @@ asyncio.run(main())
             return "Error: Execution timed out (30s limit)"
         except Exception as e:
             return f"Error: {type(e).__name__}: {e}"
-        finally:
-            Path(script_path).unlink(missing_ok=True)
 
     return execute_code
@@ -1,7 +1,7 @@
 """Skill index using LanceDB for hybrid search."""
 
 import re
-import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -10,7 +10,20 @@ import yaml
 from lancedb.pydantic import LanceModel, Vector
 from lancedb.rerankers import RRFReranker
 
-from ..embeddings import encode_query, get_embeddings
+from ..embeddings import (
+    INDEX_CACHE_DIR,
+    SEARCH_CACHE_SIZE,
+    cached_table_name,
+    compute_embeddings,
+    encode_query,
+    get_embeddings,
+    index_fingerprint,
+    load_cached_vectors,
+    open_cached_table,
+    save_cached_vectors,
+    save_table_fingerprint,
+)
+from ..memory_index import MEMORY_INDEX_MAX_DOCS, MemoryIndex
 
 # YAML frontmatter pattern: starts with ---, ends with ---
 FRONTMATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---\s*\n?", re.DOTALL)
@@ -48,25 +61,37 @@ _skill_index: "SkillIndex | None" = None
 
 
 class SkillIndex:
-    """In-memory skill index using LanceDB for hybrid search.
+    """Skill index using LanceDB for hybrid search.
 
     Supports lazy loading: index is built automatically on first search.
+    Up to MEMORY_INDEX_MAX_DOCS skills are searched in memory; more use a
+    LanceDB table. Either way the embeddings are persisted in INDEX_CACHE_DIR
+    and reused while the skill files are unchanged.
     """
 
     def __init__(self, skills_dir: Path = SKILLS_DIR) -> None:
         self.skills_dir = skills_dir
-        # Use a true temp directory to avoid polluting the workspace
-        self._temp_dir = tempfile.mkdtemp(prefix="lancedb_skills_")
-        self.db = lancedb.connect(self._temp_dir)
+        INDEX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.db = lancedb.connect(str(INDEX_CACHE_DIR))
         self.table: Any = None
+        self._memory_index: MemoryIndex | None = None
         self._skill_metadata: dict[str, dict[str, Any]] = {}
+        self._fingerprint: str | None = None
+        # Recent search results, keyed by (query, top_k); dropped whenever the index is rebuilt
+        self._search_cache: OrderedDict[tuple[str, int], tuple[dict[str, Any], ...]] = OrderedDict()
 
     def _ensure_index(self) -> None:
         """Build index lazily if not already built."""
-        if self.table is not None:
+        if self.table is not None or self._memory_index is not None:
             return
         self.build_index()
 
+    @property
+    def fingerprint(self) -> str | None:
+        """Fingerprint of the indexed skills (building the index if needed), or None if empty."""
+        self._ensure_index()
+        return self._fingerprint
+
     def _scan_skills(self) -> list[dict[str, Any]]:
         """Scan skills directory and extract metadata from SKILL.md files."""
         skills: list[dict[str, Any]] = []
@@ -143,6 +168,25 @@ class SkillIndex:
         if not skills:
             return
 
+        self._search_cache.clear()
+
+        fingerprint = index_fingerprint((s["name"], s["description"], s["text"]) for s in skills)
+        self._fingerprint = fingerprint
+
+        # Small skill sets: in-memory index over persisted (or freshly computed) vectors
+        if len(skills) <= MEMORY_INDEX_MAX_DOCS:
+            vectors = load_cached_vectors("skill_vectors", fingerprint)
+            if vectors is None:
+                vectors = compute_embeddings([s["text"] for s in skills])
+                save_cached_vectors("skill_vectors", fingerprint, vectors)
+            self._memory_index = MemoryIndex(skills, vectors)
+            return
+
+        # Reuse the persisted table if it was built from the same skills
+        self.table = open_cached_table(self.db, "skills", fingerprint)
+        if self.table is not None:
+            return
+
         # Get shared embedding model (multilingual for better Japanese support)
         # NOTE: Downloads model on first run (~500MB) to ~/.cache/huggingface/
         # Subsequent runs use the cached model and work offline.
@@ -156,11 +200,14 @@ class SkillIndex:
             vector: Vector(embeddings.ndims()) = embeddings.VectorField()  # type: ignore[valid-type]
 
         # Create table
-        self.table = self.db.create_table("skills", schema=SkillDocument, mode="overwrite")
+        self.table = self.db.create_table(
+            cached_table_name("skills", fingerprint), schema=SkillDocument, mode="overwrite"
+        )
         self.table.add(data=skills)
 
         # Create FTS index for hybrid search
         self.table.create_fts_index("text")
+        save_table_fingerprint(self.db, "skills", fingerprint)
 
     async def search(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
         """Search skills using hybrid search (BM25 + vector).
@@ -173,9 +220,27 @@ class SkillIndex:
             List of matching skills with scores.
         """
         self._ensure_index()
-        if self.table is None:
+        if self._memory_index is None and self.table is None:
             return []
 
+        key = (query, top_k)
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            self._search_cache.move_to_end(key)
+            # Copies, so callers cannot change the cached results
+            return [dict(r) for r in cached]
+
+        results = self._search(query, top_k)
+        self._search_cache[key] = tuple(results)
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return [dict(r) for r in results]
+
+    def _search(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Run a hybrid search on the built index."""
+        if self._memory_index is not None:
+            return self._format_results(self._memory_index.search(query, encode_query(query), top_k))
+
         vector = encode_query(query)
         reranker = RRFReranker()
 
@@ -1,6 +1,6 @@
 """Tool index using LanceDB for hybrid search."""
 
-import tempfile
+from collections import OrderedDict
 from typing import Any
 
 import lancedb
@@ -9,36 +9,111 @@ from lancedb.pydantic import LanceModel, Vector
 from lancedb.rerankers import RRFReranker
 from langchain_core.tools import BaseTool
 
-from ..embeddings import encode_query, get_embeddings
+from ..embeddings import (
+    INDEX_CACHE_DIR,
+    SEARCH_CACHE_SIZE,
+    cached_table_name,
+    compute_embeddings,
+    encode_query,
+    get_embeddings,
+    index_fingerprint,
+    load_cached_vectors,
+    open_cached_table,
+    save_cached_vectors,
+    save_table_fingerprint,
+)
+from ..memory_index import MEMORY_INDEX_MAX_DOCS, MemoryIndex
+
+
+def _registry_fingerprint(tools: dict[str, BaseTool]) -> str:
+    """Fingerprint the indexed fields of a tool registry."""
+    return index_fingerprint((name, t.description or "") for name, t in tools.items())
+
+
+def _tool_schema(name: str, t: BaseTool) -> dict[str, Any]:
+    """Build the JSON schema returned by tool searches (arguments, name and description)."""
+    description = t.description or ""
+    if t.args_schema and hasattr(t.args_schema, "model_json_schema"):
+        schema: dict[str, Any] = t.args_schema.model_json_schema()
+        schema["name"] = name
+        schema["description"] = description
+        return schema
+    return {"name": name, "description": description}
 
 
 class ToolIndex:
-    """In-memory tool index using LanceDB for hybrid search.
+    """Tool index using LanceDB for hybrid search.
 
     Supports lazy loading: index is built automatically on first search
     using the registry provided via get_tool_index(registry=...).
+    Registries of up to MEMORY_INDEX_MAX_DOCS tools are searched in memory;
+    larger ones use a LanceDB table. Either way the embeddings are persisted
+    in INDEX_CACHE_DIR and reused while the registry is unchanged.
     """
 
     def __init__(self) -> None:
-        self._temp_dir = tempfile.mkdtemp(prefix="lancedb_tools_")
-        self.db = lancedb.connect(self._temp_dir)
+        INDEX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.db = lancedb.connect(str(INDEX_CACHE_DIR))
         self.table: Any = None
+        self._memory_index: MemoryIndex | None = None
+        self._fingerprint: str | None = None
         self._tool_schemas: dict[str, dict[str, Any]] = {}
         self._registry: dict[str, BaseTool] | None = None
         self._warned_no_registry = False
+        # Recent search results, keyed by (query, top_k); dropped whenever the index is rebuilt
+        self._search_cache: OrderedDict[tuple[str, int], tuple[dict[str, Any], ...]] = OrderedDict()
 
     def set_registry(self, registry: dict[str, BaseTool]) -> None:
-        """Set the tool registry for lazy index building."""
+        """Set the tool registry for lazy index building.
+
+        An already built index is dropped (and rebuilt on next search) only
+        if the registry contents differ from what it was built from. Registries
+        are treated as snapshots: passing the same dict again is a no-op.
+        """
+        if registry is self._registry:
+            return
         self._registry = registry
+        self._tool_schemas.clear()
+        if self._built and _registry_fingerprint(registry) != self._fingerprint:
+            self.table = None
+            self._memory_index = None
 
     @property
     def registry(self) -> dict[str, BaseTool]:
         """Get the tool registry."""
         return self._registry or {}
 
+    def get_tool_schema(self, name: str) -> dict[str, Any] | None:
+        """Get the JSON schema of a registered tool, generating it only once.
+
+        Args:
+            name: Tool name.
+
+        Returns:
+            Schema with the tool's arguments, name and description (shared; do not
+            modify), or None if the tool is not registered.
+        """
+        schema = self._tool_schemas.get(name)
+        if schema is None:
+            t = self.registry.get(name)
+            if t is None:
+                return None
+            schema = self._tool_schemas[name] = _tool_schema(name, t)
+        return schema
+
+    @property
+    def fingerprint(self) -> str | None:
+        """Fingerprint of the indexed tools (building the index if needed), or None if empty."""
+        self._ensure_index()
+        return self._fingerprint if self._built else None
+
+    @property
+    def _built(self) -> bool:
+        return self.table is not None or self._memory_index is not None
+
     def _ensure_index(self) -> None:
         """Build index lazily if not already built."""
-        if self.table is not None:
+        if self._built:
             return
 
         if self._registry is None:
@@ -60,22 +135,15 @@ class ToolIndex:
         if not tools:
             return
 
+        self._search_cache.clear()
+
         # Prepare tool data
         tool_data: list[dict[str, Any]] = []
         for name, t in tools.items():
             description = t.description or ""
 
             # Store schema for later retrieval
-            if t.args_schema and hasattr(t.args_schema, "model_json_schema"):
-                schema = t.args_schema.model_json_schema()
-                schema["name"] = name
-                schema["description"] = description
-                self._tool_schemas[name] = schema
-            else:
-                self._tool_schemas[name] = {
-                    "name": name,
-                    "description": description,
-                }
+            self._tool_schemas[name] = _tool_schema(name, t)
 
             tool_data.append(
                 {
@@ -85,6 +153,22 @@ class ToolIndex:
                 }
             )
 
+        self._fingerprint = _registry_fingerprint(tools)
+
+        # Small registries: in-memory index over persisted (or freshly computed) vectors
+        if len(tool_data) <= MEMORY_INDEX_MAX_DOCS:
+            vectors = load_cached_vectors("tool_vectors", self._fingerprint)
+            if vectors is None:
+                vectors = compute_embeddings([d["text"] for d in tool_data])
+                save_cached_vectors("tool_vectors", self._fingerprint, vectors)
+            self._memory_index = MemoryIndex(tool_data, vectors)
+            return
+
+        # Reuse the persisted table if it was built from the same tools
+        self.table = open_cached_table(self.db, "tools", self._fingerprint)
+        if self.table is not None:
+            return
+
         # Get shared embedding model
         embeddings = get_embeddings()
 
@@ -96,11 +180,14 @@ class ToolIndex:
             vector: Vector(embeddings.ndims()) = embeddings.VectorField()  # type: ignore[valid-type]
 
         # Create table
-        self.table = self.db.create_table("tools", schema=ToolDocument, mode="overwrite")
+        self.table = self.db.create_table(
+            cached_table_name("tools", self._fingerprint), schema=ToolDocument, mode="overwrite"
+        )
         self.table.add(data=tool_data)
 
         # Create FTS index for hybrid search
         self.table.create_fts_index("text")
+        save_table_fingerprint(self.db, "tools", self._fingerprint)
 
     async def search(self, query: str, top_k: int = 5) -> list[dict[str, Any]]:
         """Search tools using hybrid search (BM25 + vector).
@@ -113,10 +200,28 @@ class ToolIndex:
             List of tool schemas with scores.
         """
         self._ensure_index()
-        if self.table is None:
+        if not self._built:
             return []
 
+        key = (query, top_k)
+        cached = self._search_cache.get(key)
+        if cached is not None:
+            self._search_cache.move_to_end(key)
+            # Copies, so callers cannot change the cached results
+            return [dict(r) for r in cached]
+
+        results = self._search(query, top_k)
+        self._search_cache[key] = tuple(results)
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return [dict(r) for r in results]
+
+    def _search(self, query: str, top_k: int) -> list[dict[str, Any]]:
+        """Run a hybrid search on the built index."""
         vector = encode_query(query)
+        if self._memory_index is not None:
+            return self._format_results(self._memory_index.search(query, vector, top_k))
+
         reranker = RRFReranker()
 
         results = (
@@ -134,7 +239,7 @@ class ToolIndex:
         """Format search results with full schemas."""
         return [
             {
-                **self._tool_schemas.get(r["name"], {"name": r["name"]}),
+                **(self.get_tool_schema(r["name"]) or {"name": r["name"]}),
                 "score": r.get("_relevance_score", 0.0),
             }
             for r in results
@@ -1,6 +1,7 @@
 """Tool search tools for dynamic tool discovery."""
 
 import re
+from functools import lru_cache
 from typing import Any
 
 import rich
@@ -11,6 +12,12 @@ from .index import get_tool_index
 PAGE_SIZE = 5
 
 
+@lru_cache(maxsize=128)
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a case-insensitive tool search pattern (memoized across searches)."""
+    return re.compile(pattern, re.IGNORECASE)
+
+
 @tool
 async def tool_search(query: str, top_k: int = 5) -> dict[str, Any]:
     """Search for tools by natural language query.
@@ -70,37 +77,25 @@ def tool_search_regex(pattern: str, page: int = 1) -> dict[str, Any]:
         tool_search_regex("weather_.*") -> tools starting with weather_
         tool_search_regex("email|calendar") -> tools matching email or calendar
     """
-    matches: list[dict[str, Any]] = []
-    index = get_tool_index()
+    try:
+        regex = _compile_pattern(pattern)
+    except re.error as e:
+        return {"error": f"Invalid regex pattern: {e}"}
 
-    for name, t in index.registry.items():
-        try:
-            name_match = re.search(pattern, name, re.IGNORECASE)
-            desc_match = re.search(pattern, t.description, re.IGNORECASE)
-        except re.error as e:
-            return {"error": f"Invalid regex pattern: {e}"}
-
-        if name_match or desc_match:
-            if t.args_schema and hasattr(t.args_schema, "model_json_schema"):
-                schema = t.args_schema.model_json_schema()
-                schema["name"] = name
-                schema["description"] = t.description
-                matches.append(schema)
-            else:
-                matches.append(
-                    {
-                        "name": name,
-                        "description": t.description,
-                    }
-                )
+    index = get_tool_index()
+    search = regex.search
+    matches = [(name, t) for name, t in index.registry.items() if search(name) or search(t.description)]
 
     total_matches = len(matches)
     total_pages = (total_matches + PAGE_SIZE - 1) // PAGE_SIZE if total_matches else 1
 
-    # Apply pagination (1-indexed)
+    # Apply pagination (1-indexed); schemas are only built for the returned page
     start = (page - 1) * PAGE_SIZE
     end = start + PAGE_SIZE
-    page_matches = matches[start:end]
+    page_matches: list[dict[str, Any]] = []
+    for name, t in matches[start:end]:
+        schema = index.get_tool_schema(name)
+        page_matches.append(dict(schema) if schema is not None else {"name": name, "description": t.description})
 
     if not total_matches:
         message = "No tools found."